@@ -0,0 +1,448 @@
+"""
+Benchmarks of the bot's hot path over seeded synthetic candles.
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --compare baseline.json
+
+Results are JSON, one entry per case with its parameters and per-item
+timings. --compare matches cases by id against a stored run and exits
+with status 1 when any got slower than the threshold. Each repeat is
+timed against a calibration workload run right after it, so a machine
+that is slower overall (CPU throttling, a busy VM host) isn't reported as
+a regression, and a case only counts when all its repeats are clear of
+the baseline's, see `compare`.
+"""
+import argparse
+import contextlib
+import glob
+import importlib.metadata
+import io
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import requests
+from ta.momentum import RSIIndicator
+from ta.trend import MACD, SMAIndicator
+from ta.volatility import BollingerBands
+
+import bot.config
+from bot import kernels
+from bot.analyzer import Analyzer
+from bot.cache import AnalysisCache
+from bot.config import Config
+from bot.exchange import ohlcv_frame
+from bot.notifier import Notifier
+from main import BotManager
+from .synthetic import GENERATORS, generate, load_payload
+from .telegram_stub import TelegramStub
+
+BACKENDS = ("ta", "numpy", "streaming")
+CONFIG_PATH = Path(bot.config.__file__).parent.parent / "config.csv"
+
+def _settings(**overrides) -> Config:
+    """Config with the default settings, so a local config.csv doesn't change the results"""
+    existed = CONFIG_PATH.exists()
+    config = Config()
+    if not existed and CONFIG_PATH.exists():
+        CONFIG_PATH.unlink()  # Config writes the defaults on first use, don't leave them behind
+    config.config = {**config.default_config, **{key: str(value) for key, value in overrides.items()}}
+    return config
+
+def measure(function: Callable, items: int = 1, repeat: int = 5, min_time: float = 0.2,
+            setup: Optional[Callable] = None) -> Dict[str, float]:
+    """
+    Time `function(setup())`, setup untimed. A warm-up call picks how many
+    calls make a repeat last at least `min_time`, so short cases aren't
+    lost in timer noise. Timings are per item: one call covers `items`
+    items (symbols, messages, lookups).
+
+    Every repeat is followed by a calibration block of about the same
+    length, and the repeat's time divided by the calibration's is its
+    ratio. Both saw the machine in the same state, so the ratios hold
+    steady when the machine as a whole gets faster or slower, see `compare`.
+    """
+    started = time.perf_counter()
+    function(setup() if setup else None)
+    number = max(1, math.ceil(min_time / max(time.perf_counter() - started, 1e-9)))
+
+    timings, ratios, calibrations = [], [], []
+    for _ in range(repeat):
+        elapsed = 0.0
+        for _ in range(number):
+            argument = setup() if setup else None
+            started = time.perf_counter()
+            function(argument)
+            elapsed += time.perf_counter() - started
+        timings.append(elapsed / (number * items))
+        calibrations.append(calibrate(duration=elapsed))
+        ratios.append(timings[-1] / calibrations[-1])
+    return {
+        "median_s": statistics.median(timings),
+        "min_s": min(timings),
+        "max_s": max(timings),
+        "repeat": repeat,
+        "number": number,
+        "items": items,
+        "calibration_s": statistics.median(calibrations),
+        "ratio": statistics.median(ratios),
+        "ratio_min": min(ratios),
+        "ratio_max": max(ratios),
+    }
+
+def _calibration_work():
+    total = 0
+    for i in range(20000):
+        total += i * i % 7
+    pd.Series(np.arange(2000.0)).rolling(14).mean()
+    return total
+
+def calibrate(duration: float = 0.05) -> float:
+    """Mean time of a fixed Python and pandas workload run for about `duration` seconds, the machine's speed right now"""
+    calls, started = 0, time.perf_counter()
+    while True:
+        _calibration_work()
+        calls += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= duration:
+            return elapsed / calls
+
+def allocations(function: Callable, items: int = 1) -> Dict[str, float]:
+    """Peak traced memory above the starting point during one `function(None)` call, per item"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        function(None)
+        peak = tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+    return {"alloc_peak_bytes": peak / items}
+
+def legacy_ohlcv_frame(ohlcv, symbol: str) -> pd.DataFrame:
+    """ohlcv_frame as it was before CandleBuffer: DataFrame from the row lists, then the conversions"""
+    df = pd.DataFrame(list(ohlcv), columns=["timestamp", "open", "high", "low", "close", "volume"])
+    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
+    df["symbol"] = symbol
+    return df
+
+def case_id(name: str, params: Dict) -> str:
+    return name + "[" + ",".join(f"{key}={value}" for key, value in params.items()) + "]"
+
+def _ta_indicators(close: pd.Series, volume: pd.Series, settings: Config) -> Dict[str, pd.Series]:
+    """The indicator columns the "ta" backend of Analyzer.analyze computes"""
+    macd = MACD(close=close)
+    bb = BollingerBands(close=close, window=settings.BB_WINDOW, window_dev=2)
+    avg_volume = volume.rolling(window=10).mean()
+    return {
+        'rsi': RSIIndicator(close=close, window=settings.RSI_WINDOW).rsi(),
+        'ma_short': SMAIndicator(close=close, window=settings.SMA_SHORT).sma_indicator(),
+        'ma_long': SMAIndicator(close=close, window=settings.SMA_LONG).sma_indicator(),
+        'macd': macd.macd(),
+        'macd_signal': macd.macd_signal(),
+        'bb_upper': bb.bollinger_hband(),
+        'bb_lower': bb.bollinger_lband(),
+        'avg_volume': avg_volume,
+        'volume_spike': volume > avg_volume * settings.VOLUME_SPIKE_RATIO,
+    }
+
+class Suite:
+    def __init__(self, sizes: List[int], symbol_counts: List[int], generators: List[str],
+                 backends: List[str], repeat: int, seed: int, payloads: Optional[str] = None,
+                 kernel_sizes: Optional[List[int]] = None):
+        self.sizes = sizes
+        self.kernel_sizes = kernel_sizes or []
+        self.symbol_counts = symbol_counts
+        self.generators = generators
+        self.backends = backends
+        self.repeat = repeat
+        self.seed = seed
+        self.payloads = payloads
+        self.results: List[Dict] = []
+
+    def _rows(self, generator: str, size: int, symbols: int) -> List[List[list]]:
+        """Seeded per symbol, round-tripped through JSON so the types match a ccxt response"""
+        return [json.loads(json.dumps(generate(generator, size, seed=self.seed * 1000 + index)))
+                for index in range(symbols)]
+
+    def _record(self, name: str, params: Dict, timing: Dict):
+        result = {"id": case_id(name, params), "name": name, "params": params, **timing}
+        self.results.append(result)
+        memory = f" {timing['alloc_peak_bytes'] / 1024:10.1f} KiB peak" if "alloc_peak_bytes" in timing else ""
+        print(f"{result['id']:<80} {timing['median_s'] * 1e6:12.1f} us/item{memory}", file=sys.stderr)
+
+    def bench_analyze(self):
+        """Analyzer.analyze per symbol, steady state: warm caches and streaming engines, fresh frames"""
+        for backend in self.backends:
+            for generator in self.generators:
+                for size in self.sizes:
+                    for symbols in self.symbol_counts:
+                        settings = _settings(ANALYZER_BACKEND=backend)
+                        cache = AnalysisCache(max_bytes=int(settings.ANALYSIS_CACHE_MB * 1024 * 1024))
+                        analyzer = Analyzer(settings, cache=cache if backend == "numpy" else None)
+                        frames = [ohlcv_frame(rows, f"S{i}/USDT")
+                                  for i, rows in enumerate(self._rows(generator, size, symbols))]
+
+                        def run(batch):
+                            for df in batch:
+                                analyzer.analyze(df)
+
+                        timing = measure(run, items=symbols, repeat=self.repeat,
+                                         setup=lambda: [df.copy() for df in frames])
+                        self._record("analyze", {"backend": backend, "generator": generator,
+                                                 "size": size, "symbols": symbols}, timing)
+
+    def bench_kernels(self):
+        """Indicator columns over long histories: bot.kernels on a (symbols, size) batch against ta per symbol"""
+        settings = _settings()
+        for generator in self.generators:
+            for size in self.kernel_sizes:
+                for symbols in self.symbol_counts:
+                    candles = np.array(self._rows(generator, size, symbols))
+                    close, volume = candles[..., 4], candles[..., 5]
+                    del candles
+
+                    def run_numpy(_):
+                        kernels.indicators(close, volume, rsi_window=settings.RSI_WINDOW,
+                                           sma_short=settings.SMA_SHORT, sma_long=settings.SMA_LONG,
+                                           bb_window=settings.BB_WINDOW,
+                                           volume_spike_ratio=settings.VOLUME_SPIKE_RATIO)
+
+                    def run_ta(_):
+                        for row in range(symbols):
+                            _ta_indicators(pd.Series(close[row]), pd.Series(volume[row]), settings)
+
+                    for backend, run in (("numpy", run_numpy), ("ta", run_ta)):
+                        timing = measure(run, items=symbols, repeat=self.repeat)
+                        self._record("kernels", {"backend": backend, "generator": generator,
+                                                 "size": size, "symbols": symbols}, timing)
+
+    def bench_ohlcv_frame(self):
+        """
+        Parsing ccxt payloads into the DataFrame Exchange.get_ohlcv returns, against
+        the pre-CandleBuffer path (ohlcv_frame_legacy), with time and peak memory
+        """
+        payloads = {generator: None for generator in self.generators}
+        if self.payloads:
+            for path in sorted(glob.glob(os.path.join(self.payloads, "*.json"))):
+                payloads["recorded:" + os.path.splitext(os.path.basename(path))[0]] = load_payload(path)
+
+        for source, recorded in payloads.items():
+            for size in ([len(recorded)] if recorded is not None else self.sizes):
+                for symbols in self.symbol_counts:
+                    batch = [recorded] * symbols if recorded is not None else self._rows(source, size, symbols)
+
+                    for name, build in (("ohlcv_frame", ohlcv_frame), ("ohlcv_frame_legacy", legacy_ohlcv_frame)):
+                        def run(_, build=build):
+                            for i, rows in enumerate(batch):
+                                build(rows, f"S{i}/USDT")
+
+                        timing = measure(run, items=symbols, repeat=self.repeat)
+                        timing.update(allocations(run, items=symbols))
+                        self._record(name, {"source": source, "size": size, "symbols": symbols}, timing)
+
+    def bench_format_message(self):
+        """BotManager's Telegram/log message formatting from an analysis result"""
+        settings = _settings()
+        manager = BotManager.__new__(BotManager)  # Only the config is needed, no exchange connection
+        manager.config = settings
+        snapshot = settings.snapshot()
+        signal, latest = Analyzer(settings).analyze(ohlcv_frame(generate("random_walk", 200, self.seed), "BTC/USDT"))
+        with_trends = {**latest, "trends": {"4h": "UP", "1d": "DOWN"}}
+        messages = 1000
+
+        cases = {
+            "single": lambda _: [manager._format_message(signal, latest) for _ in range(messages)],
+            "single_trends": lambda _: [manager._format_message(signal, with_trends) for _ in range(messages)],
+            "watchlist": lambda _: [BotManager._format_watchlist_message("BTC/USDT", snapshot, signal, latest)
+                                    for _ in range(messages)],
+        }
+        for variant, run in cases.items():
+            self._record("format_message", {"variant": variant},
+                         measure(run, items=messages, repeat=self.repeat))
+
+    def bench_config_access(self):
+        """Config.__getattr__ lookups of int, float and str settings, against a snapshot"""
+        settings = _settings()
+        snapshot = settings.snapshot()
+        names = ["RSI_WINDOW", "SMA_SHORT", "SMA_LONG", "VOLUME_SPIKE_RATIO", "TIMEFRAME", "ANALYZER_BACKEND"]
+        lookups = 1000
+
+        for variant, source in (("config", settings), ("snapshot", snapshot)):
+            def run(_, source=source):
+                for _ in range(lookups // len(names)):
+                    for name in names:
+                        getattr(source, name)
+
+            items = lookups // len(names) * len(names)
+            self._record("config_access", {"variant": variant},
+                         measure(run, items=items, repeat=self.repeat))
+
+    def bench_notify_session(self):
+        """Telegram sends to a local stand-in: a new connection per requests.post against the pooled session"""
+        settings = _settings(TELEGRAM_TOKEN="bench", TELEGRAM_CHAT_ID="1")
+        messages = 50
+        with TelegramStub() as stub, contextlib.redirect_stdout(io.StringIO()):
+            notifier = Notifier(settings, api_url=stub.url)
+            url = f"{stub.url}/botbench/sendMessage"
+
+            def per_call(_):
+                for _ in range(messages):
+                    requests.post(url, json={"chat_id": "1", "text": "BTC/USDT BUY"}, timeout=10).raise_for_status()
+
+            def pooled(_):
+                for _ in range(messages):
+                    notifier.send("BTC/USDT BUY")
+
+            for variant, run in (("per_call", per_call), ("pooled", pooled)):
+                self._record("notify_session", {"variant": variant},
+                             measure(run, items=messages, repeat=self.repeat))
+
+    def run(self, benchmarks: List[str]):
+        for name in benchmarks:
+            getattr(self, f"bench_{name}")()
+        return self.results
+
+BENCHMARKS = ["analyze", "kernels", "ohlcv_frame", "format_message", "config_access", "notify_session"]
+
+def _version(package: str) -> Optional[str]:
+    try:
+        return importlib.metadata.version(package)
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+def environment() -> Dict[str, object]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, cwd=os.path.dirname(__file__), timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "ta": _version("ta"),
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+def _spread(result: Dict, normalize: bool):
+    """(typical, low, high) of a case's repeats: calibration ratios, or raw seconds per item"""
+    if normalize and "ratio" in result:
+        return result["ratio"], result["ratio_min"], result["ratio_max"]
+    return result["median_s"], result["min_s"], result["max_s"]
+
+def compare(report: Dict, baseline: Dict, threshold: float, normalize: bool = True) -> int:
+    """
+    Print each case against the baseline, returns the number of regressions.
+
+    The change is between the median repeats, as calibration ratios unless
+    `normalize` is off (or the baseline predates them). A case slower than
+    `threshold` only counts as a regression when it is clear of the noise:
+    its fastest repeat must be slower than the baseline's slowest repeat by
+    `threshold` too. Cases slower on the median only are reported as noisy.
+    """
+    results = report["results"]
+    before = {result["id"]: result for result in baseline["results"]}
+    regressions = noisy = 0
+    normalize = normalize and all("ratio" in result for result in baseline["results"])
+    print(f"{'case (median of repeats, per item)':<80} {'baseline':>12} {'current':>12} {'change':>8}")
+    for result in results:
+        old = before.get(result["id"])
+        if old is None:
+            print(f"{result['id']:<80} {'-':>12} {result['median_s'] * 1e6:10.1f}us {'new':>8}")
+            continue
+        typical, low, _ = _spread(result, normalize)
+        old_typical, _, old_high = _spread(old, normalize)
+        change = typical / old_typical - 1
+        current = old["median_s"] * (1 + change)  # In the baseline's seconds when normalized
+        verdict = ""
+        if change > threshold:
+            if low > old_high * (1 + threshold):
+                regressions += 1
+                verdict = "  REGRESSION"
+            else:
+                noisy += 1
+                verdict = "  noisy"
+        print(f"{result['id']:<80} {old['median_s'] * 1e6:10.1f}us {current * 1e6:10.1f}us "
+              f"{change * 100:+7.1f}%{verdict}")
+
+    missing = sorted(set(before) - {result["id"] for result in results})
+    if missing:
+        print(f"{len(missing)} baseline cases were not run")
+    print("Compared as ratios to the calibration workload" if normalize else "Compared as raw timings")
+    env = baseline.get("environment", {})
+    current = environment()
+    differs = [key for key in ("python", "machine", "numpy", "pandas", "ta") if env.get(key) != current[key]]
+    if differs:
+        print("Baseline recorded with a different " + ", ".join(differs) + ", timings may not be comparable")
+    print(f"{regressions} regressions over {threshold * 100:.0f}%"
+          + (f", {noisy} more cases slower but within the noise of their repeats" if noisy else ""))
+    return regressions
+
+def _int_list(text: str) -> List[int]:
+    return [int(value) for value in text.split(",") if value]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Creepy Bot benchmarks")
+    parser.add_argument("--bench", default=",".join(BENCHMARKS), help="benchmarks to run, comma separated")
+    parser.add_argument("--sizes", type=_int_list, default=[100, 500, 2000], help="candles per symbol")
+    parser.add_argument("--kernel-sizes", type=_int_list, default=[10_000, 1_000_000],
+                        help="candles per symbol for the kernels benchmark")
+    parser.add_argument("--symbols", type=_int_list, default=[1, 10], help="symbol counts")
+    parser.add_argument("--generators", default=",".join(GENERATORS), help="synthetic data generators")
+    parser.add_argument("--backends", default=",".join(BACKENDS), help="analyzer backends")
+    parser.add_argument("--repeat", type=int, default=5, help="timed repeats per case, the median is reported")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--payloads", help="folder of recorded ccxt OHLCV payloads (*.json) for ohlcv_frame")
+    parser.add_argument("--quick", action="store_true", help="small sweep: 100 and 500 candles (10k for kernels), 1 symbol, 5 repeats")
+    parser.add_argument("--output", help="write the JSON results here instead of stdout")
+    parser.add_argument("--compare", help="baseline JSON to compare against, exits 1 on a regression")
+    parser.add_argument("--no-normalize", action="store_true", help="compare raw timings instead of ratios to the calibration workload")
+    parser.add_argument("--threshold", type=float, default=0.15, help="slowdown counted as a regression (0.15 = 15%%)")
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        args.sizes, args.symbols, args.repeat = [100, 500], [1], 5
+        args.kernel_sizes = [10_000]
+    benchmarks = [name for name in args.bench.split(",") if name]
+    unknown = set(benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    suite = Suite(args.sizes, args.symbols, args.generators.split(","), args.backends.split(","),
+                  args.repeat, args.seed, args.payloads, args.kernel_sizes)
+    results = suite.run(benchmarks)
+    report = {
+        "environment": environment(),
+        "settings": {"sizes": args.sizes, "kernel_sizes": args.kernel_sizes, "symbols": args.symbols, "repeat": args.repeat, "seed": args.seed},
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    elif not args.compare:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.threshold, normalize=not args.no_normalize):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
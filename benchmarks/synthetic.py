@@ -0,0 +1,79 @@
+import json
+import numpy as np
+from typing import Callable, Dict, List
+
+HOUR_MS = 60 * 60 * 1000
+START_MS = 1_700_000_000_000 - 1_700_000_000_000 % HOUR_MS  # Fixed so payloads are identical between runs
+
+def _candles(close: np.ndarray, rng: np.random.Generator, timestamps: np.ndarray,
+             spread: float, opens: np.ndarray = None) -> List[list]:
+    """ccxt-shaped [timestamp, open, high, low, close, volume] rows around a close path"""
+    if opens is None:
+        opens = np.concatenate(([close[0]], close[:-1]))
+    wick = np.abs(rng.normal(0, spread, (2, len(close))))
+    high = np.maximum(opens, close) * (1 + wick[0])
+    low = np.minimum(opens, close) * (1 - wick[1])
+    volume = rng.lognormal(mean=6, sigma=0.5, size=len(close))
+    volume[rng.random(len(close)) < 0.03] *= 4  # The odd volume spike
+    return [
+        [int(ts), float(o), float(h), float(l), float(c), float(v)]
+        for ts, o, h, l, c, v in zip(timestamps, opens, high, low, close, volume)
+    ]
+
+def _hours(n: int) -> np.ndarray:
+    return START_MS + np.arange(n, dtype=np.int64) * HOUR_MS
+
+def random_walk(n: int, seed: int = 0, price: float = 100.0) -> List[list]:
+    """Driftless geometric random walk, 1% hourly moves"""
+    rng = np.random.default_rng(seed)
+    close = price * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    return _candles(close, rng, _hours(n), 0.004)
+
+def trending(n: int, seed: int = 0, price: float = 100.0) -> List[list]:
+    """Steady uptrend with small pullbacks, keeps RSI high and the MAs crossed"""
+    rng = np.random.default_rng(seed)
+    close = price * np.exp(np.cumsum(rng.normal(0.003, 0.006, n)))
+    return _candles(close, rng, _hours(n), 0.002)
+
+def volatile(n: int, seed: int = 0, price: float = 100.0) -> List[list]:
+    """Fat-tailed moves with calm and wild regimes, lots of band breaks and signal flips"""
+    rng = np.random.default_rng(seed)
+    regime = np.repeat(rng.choice([0.005, 0.04], size=n // 24 + 1), 24)[:n]
+    close = price * np.exp(np.cumsum(rng.standard_t(3, n) * regime))
+    return _candles(close, rng, _hours(n), 0.015)
+
+def gappy(n: int, seed: int = 0, price: float = 100.0) -> List[list]:
+    """Random walk with missing candles, opening gaps and dead zero-volume hours"""
+    rng = np.random.default_rng(seed)
+    close = price * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    opens = np.concatenate(([close[0]], close[:-1]))
+    jumps = rng.random(n) < 0.02
+    opens[jumps] *= 1 + rng.choice([-0.05, 0.05], size=jumps.sum())
+    # Skip about one hour in ten, timestamps keep counting so the gaps show
+    steps = np.where(rng.random(n) < 0.1, 2, 1)
+    timestamps = START_MS + np.concatenate(([0], np.cumsum(steps[1:]))) * HOUR_MS
+    rows = _candles(close, rng, timestamps, 0.004, opens=opens)
+    for row, dead in zip(rows, rng.random(n) < 0.05):
+        if dead:
+            row[1] = row[2] = row[3] = row[4]
+            row[5] = 0.0
+    return rows
+
+GENERATORS: Dict[str, Callable[..., List[list]]] = {
+    "random_walk": random_walk,
+    "trending": trending,
+    "volatile": volatile,
+    "gappy": gappy,
+}
+
+def generate(name: str, n: int, seed: int = 0) -> List[list]:
+    return GENERATORS[name](n, seed)
+
+def save_payload(path: str, rows: List[list]):
+    """Store an OHLCV payload (e.g. from Exchange.exchange.fetch_ohlcv) for the benchmarks"""
+    with open(path, "w") as f:
+        json.dump(rows, f)
+
+def load_payload(path: str) -> List[list]:
+    with open(path) as f:
+        return json.load(f)
@@ -0,0 +1,51 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, like api.telegram.org
+    disable_nagle_algorithm = True
+    sent = json.dumps({"ok": True, "result": {"message_id": 1}}).encode()
+    error = json.dumps({"ok": False, "description": "stub error"}).encode()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.hits += 1
+        body = self.sent if self.server.status == 200 else self.error
+        self.send_response(self.server.status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class TelegramStub:
+    """
+    Local plain-HTTP stand-in for the Bot API's sendMessage. Every POST is
+    answered with `status` (200 by default, with an ok body, else an error body) and counted in `hits`.
+
+        with TelegramStub() as stub:
+            Notifier(config, api_url=stub.url).send("hi")
+    """
+
+    def __init__(self, status: int = 200):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.daemon_threads = True
+        self.server.status = status
+        self.server.hits = 0
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self) -> "TelegramStub":
+        self._thread.start()
+        return self
+
+    @property
+    def hits(self) -> int:
+        return self.server.hits
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
@@ -1,15 +1,42 @@
 from ta.momentum import RSIIndicator
 from ta.trend import SMAIndicator, MACD
 from ta.volatility import BollingerBands
+import numpy as np
 import pandas as pd
+from . import kernels
+from .streaming import StreamingIndicators
 
 class Analyzer:
-    def __init__(self, config):
+    def __init__(self, config, cache=None):
         self.config = config
+        self.cache = cache  # AnalysisCache reused across Analyzer rebuilds, for the "numpy" backend
+        self._engines = {}  # (symbol, timeframe) -> StreamingIndicators, for the "streaming" backend
 
-    def analyze(self, df):
+    def analyze(self, df, timeframe=None):
+        timeframe = timeframe or self.config.TIMEFRAME
         if df.empty:
-            return "HOLD", {"symbol": df.get("symbol", "N/A"), "error": "Empty data"}
+            return "HOLD", {"symbol": df.attrs.get("symbol", "N/A"), "error": "Empty data"}
+
+        if self.config.ANALYZER_BACKEND == "streaming":
+            latest = df.iloc[-1].to_dict()
+            latest.update(self._streaming_indicators(df, timeframe))
+            latest['symbol'] = self._symbol(df)
+            latest['volume_spike'] = latest['volume'] > (latest['avg_volume'] * self.config.VOLUME_SPIKE_RATIO)
+            signal = self._generate_signal(latest)
+            return signal, latest
+
+        if self.config.ANALYZER_BACKEND == "numpy":
+            if self.cache is not None:
+                columns = self._cached_indicators(df, timeframe)
+            else:
+                columns = self._kernel_indicators(df['close'].values, df['volume'].values)
+            for name, values in columns.items():
+                df[name] = values
+            latest = df.iloc[-1].to_dict()
+            latest['symbol'] = self._symbol(df)
+            signal = self._generate_signal(latest)
+            return signal, latest
+
         # Calculate indicators
         df['rsi'] = RSIIndicator(close=df['close'], window=self.config.RSI_WINDOW).rsi()
         df['ma_short'] = SMAIndicator(close=df['close'], window=self.config.SMA_SHORT).sma_indicator()
@@ -27,11 +54,171 @@ class Analyzer:
         df['volume_spike'] = df['volume'] > (df['avg_volume'] * self.config.VOLUME_SPIKE_RATIO)
 
         latest = df.iloc[-1].to_dict()
-        latest['symbol'] = df['symbol'].iloc[-1]  # Ensure symbol is included
+        latest['symbol'] = self._symbol(df)  # Ensure symbol is included
 
         signal = self._generate_signal(latest)
         return signal, latest
 
+    def analyze_batch(self, symbols, close, volume) -> pd.DataFrame:
+        """
+        Analyze many symbols in one vectorized pass.
+
+        Args:
+            symbols: Symbol names, one per row
+            close: Close prices, shape (symbols, candles), aligned on the same candles
+            volume: Volumes with the same shape as close
+
+        Returns:
+            pd.DataFrame: Latest indicator values and signal per symbol, indexed by symbol
+        """
+        close = np.asarray(close, dtype=np.float64)
+        volume = np.asarray(volume, dtype=np.float64)
+        if close.ndim != 2 or close.shape != volume.shape or close.shape[0] != len(symbols):
+            raise ValueError("close and volume must both have shape (len(symbols), candles)")
+
+        latest = {'close': close[:, -1], 'volume': volume[:, -1]}
+        for name, values in self._kernel_indicators(close, volume).items():
+            latest[name] = values[:, -1]
+
+        buy, sell = kernels.signal_masks(latest)
+        table = pd.DataFrame(latest, index=pd.Index(symbols, name='symbol'))
+        table['signal'] = np.where(buy, "BUY", np.where(sell, "SELL", "HOLD"))
+        return table
+
+    @staticmethod
+    def _symbol(df):
+        """Exchange frames carry the symbol in df.attrs, older ones in a 'symbol' column"""
+        if df.attrs.get('symbol') is not None:
+            return df.attrs['symbol']
+        return df['symbol'].iloc[-1] if 'symbol' in df else "N/A"
+
+    def _kernel_indicators(self, close, volume):
+        return kernels.indicators(
+            close, volume,
+            rsi_window=self.config.RSI_WINDOW,
+            sma_short=self.config.SMA_SHORT,
+            sma_long=self.config.SMA_LONG,
+            bb_window=self.config.BB_WINDOW,
+            volume_spike_ratio=self.config.VOLUME_SPIKE_RATIO
+        )
+
+    def _cached_indicators(self, df, timeframe):
+        """
+        Kernel indicators where everything up to the last closed candle comes
+        from the cache and only the forming (last) candle is computed.
+        """
+        close = df['close'].values
+        volume = df['volume'].values
+        c = self.config
+        # Every indicator must be defined on the last closed candle to continue from it
+        warmup = max(c.RSI_WINDOW, c.SMA_SHORT, c.SMA_LONG, c.BB_WINDOW, 10,
+                     kernels.MACD_SLOW + kernels.MACD_SIGN - 1)
+        if len(df) - 1 < warmup:
+            return self._kernel_indicators(close, volume)
+
+        timestamps = df['timestamp'].values.astype('datetime64[ms]').astype('int64')
+        key = (
+            c.EXCHANGE, self._symbol(df), timeframe, int(timestamps[-2]), len(df) - 1,
+            (c.RSI_WINDOW, c.SMA_SHORT, c.SMA_LONG, c.BB_WINDOW, c.VOLUME_SPIKE_RATIO)
+        )
+        entry = self.cache.get(key)
+        if entry is None:
+            closed = self._kernel_indicators(close[:-1], volume[:-1])
+            avg_gain, avg_loss = kernels.wilder_averages(close[:-1], c.RSI_WINDOW)
+            ema_fast, ema_slow = kernels.macd_emas(close[:-1])
+            state = {
+                'avg_gain': avg_gain[-1],
+                'avg_loss': avg_loss[-1],
+                'ema_fast': ema_fast[-1],
+                'ema_slow': ema_slow[-1],
+                'macd_signal': closed['macd_signal'][-1],
+            }
+            entry = (closed, state)
+            self.cache.put(key, entry, sum(values.nbytes for values in closed.values()))
+
+        closed, state = entry
+        tail = self._tail_indicators(state, close, volume)
+        return {name: np.append(values, tail[name]) for name, values in closed.items()}
+
+    def _tail_indicators(self, state, close, volume):
+        """Indicators of the last candle, continuing the smoothing state of the one before"""
+        c = self.config
+        change = close[-1] - close[-2]
+        avg_gain = state['avg_gain'] + (max(change, 0.0) - state['avg_gain']) / c.RSI_WINDOW
+        avg_loss = state['avg_loss'] + (max(-change, 0.0) - state['avg_loss']) / c.RSI_WINDOW
+        ema_fast = state['ema_fast'] + 2 / (kernels.MACD_FAST + 1) * (close[-1] - state['ema_fast'])
+        ema_slow = state['ema_slow'] + 2 / (kernels.MACD_SLOW + 1) * (close[-1] - state['ema_slow'])
+        macd = ema_fast - ema_slow
+        bb_window = close[-c.BB_WINDOW:]
+        bb_middle, bb_std = bb_window.mean(), bb_window.std()
+        avg_volume = volume[-10:].mean()
+        return {
+            'rsi': 100.0 if avg_loss == 0 else 100 - 100 / (1 + avg_gain / avg_loss),
+            'ma_short': close[-c.SMA_SHORT:].mean(),
+            'ma_long': close[-c.SMA_LONG:].mean(),
+            'macd': macd,
+            'macd_signal': state['macd_signal'] + 2 / (kernels.MACD_SIGN + 1) * (macd - state['macd_signal']),
+            'bb_upper': bb_middle + 2 * bb_std,
+            'bb_lower': bb_middle - 2 * bb_std,
+            'avg_volume': avg_volume,
+            'volume_spike': volume[-1] > avg_volume * c.VOLUME_SPIKE_RATIO,
+        }
+
+    def _streaming_indicators(self, df, timeframe):
+        """Feed only the candles the symbol's engine hasn't seen yet (plus the forming one)"""
+        key = (self._symbol(df), timeframe)
+        timestamps = df['timestamp'].values.astype('datetime64[ms]').astype('int64')
+        engine = self._engines.get(key)
+
+        if engine is None or engine.last_timestamp is None or timestamps[0] > engine.last_timestamp:
+            # First call or a gap in the data: start over from this frame
+            engine = StreamingIndicators(
+                rsi_window=self.config.RSI_WINDOW,
+                sma_short=self.config.SMA_SHORT,
+                sma_long=self.config.SMA_LONG,
+                bb_window=self.config.BB_WINDOW
+            )
+            self._engines[key] = engine
+            start = 0
+        else:
+            start = int(timestamps.searchsorted(engine.last_timestamp))
+
+        closes = df['close'].values
+        volumes = df['volume'].values
+        for i in range(start, len(df)):
+            engine.update(int(timestamps[i]), float(closes[i]), float(volumes[i]))
+        return engine.values()
+
+    def confirm(self, signal, frames):
+        """
+        Multi-timeframe confirmation: a BUY or SELL only stands if every higher
+        timeframe trends the same way (short MA and MACD on the same side of
+        long MA and MACD signal), otherwise it becomes HOLD.
+
+        Args:
+            signal: Signal on the base timeframe
+            frames: OHLCV DataFrames keyed by higher timeframe
+
+        Returns:
+            (signal, trends) with trends mapping each timeframe to "UP", "DOWN" or "FLAT"
+        """
+        trends = {}
+        for timeframe, df in frames.items():
+            _, latest = self.analyze(df, timeframe=timeframe)
+            if latest.get('ma_short', np.nan) > latest.get('ma_long', np.nan) and \
+                    latest.get('macd', np.nan) > latest.get('macd_signal', np.nan):
+                trends[timeframe] = "UP"
+            elif latest.get('ma_short', np.nan) < latest.get('ma_long', np.nan) and \
+                    latest.get('macd', np.nan) < latest.get('macd_signal', np.nan):
+                trends[timeframe] = "DOWN"
+            else:
+                trends[timeframe] = "FLAT"
+
+        required = {"BUY": "UP", "SELL": "DOWN"}.get(signal)
+        if required and any(trend != required for trend in trends.values()):
+            signal = "HOLD"
+        return signal, trends
+
     def _generate_signal(self, data):
         buy_conditions = (
             data['rsi'] < 30 and
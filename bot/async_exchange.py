@@ -0,0 +1,88 @@
+import asyncio
+import ccxt.async_support as ccxt_async
+import numpy as np
+from typing import Dict, List, Optional
+from .exchange import ohlcv_frame
+
+class AsyncExchange:
+    """
+    Concurrent OHLCV fetching for many symbols on top of ccxt.async_support.
+
+    Requests run in parallel up to `max_concurrency` at a time, while ccxt's
+    own rate limiter (enableRateLimit) still spaces them out, so fetching N
+    symbols takes about as long as the slowest request instead of the sum.
+    The sync `gather_ohlcv` wrapper keeps one event loop for the lifetime of
+    the object, so it can be called repeatedly from the bot thread.
+    """
+
+    def __init__(self, exchange_name: str = 'binance', max_concurrency: int = 10, client=None):
+        self.exchange_name = exchange_name
+        self.max_concurrency = max_concurrency
+        self.last_errors: Dict[str, Exception] = {}
+        self._client = client
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def client(self):
+        # Created lazily so the aiohttp session belongs to the loop that uses it
+        if self._client is None:
+            self._client = getattr(ccxt_async, self.exchange_name)({
+                'enableRateLimit': True
+            })
+        return self._client
+
+    async def fetch_ohlcv(self, symbol: str, timeframe: str, limit: int = 100) -> list:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            return await self.client.fetch_ohlcv(symbol, timeframe=timeframe, limit=limit)
+
+    async def fetch_many(self, symbols: List[str], timeframe: str, limit: int = 100,
+                         as_arrays: bool = False) -> Dict:
+        """
+        Fetch OHLCV for every symbol concurrently.
+
+        Args:
+            symbols: Trading pair symbols (e.g. ['BTC/USDT', 'ETH/USDT'])
+            timeframe: Timeframe for candles (e.g. '1h')
+            limit: Number of candles per symbol
+            as_arrays: Return float64 arrays of shape (candles, 6) instead of DataFrames
+
+        Returns:
+            dict: symbol -> DataFrame (or array). Failed symbols are left out and
+            their exceptions kept in `last_errors`.
+        """
+        results = await asyncio.gather(
+            *(self.fetch_ohlcv(symbol, timeframe, limit) for symbol in symbols),
+            return_exceptions=True
+        )
+
+        data, self.last_errors = {}, {}
+        for symbol, ohlcv in zip(symbols, results):
+            if isinstance(ohlcv, Exception):
+                self.last_errors[symbol] = ohlcv
+            elif as_arrays:
+                data[symbol] = np.asarray(ohlcv, dtype=np.float64).reshape(-1, 6)
+            else:
+                data[symbol] = ohlcv_frame(ohlcv, symbol)
+        return data
+
+    def gather_ohlcv(self, symbols: List[str], timeframe: str, limit: int = 100,
+                     as_arrays: bool = False) -> Dict:
+        """Blocking version of fetch_many for callers outside an event loop"""
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(self.fetch_many(symbols, timeframe, limit, as_arrays))
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.close()
+
+    def close(self):
+        """Close the exchange session and the private event loop used by gather_ohlcv"""
+        if self._loop is None:
+            return
+        self._loop.run_until_complete(self.aclose())
+        self._loop.close()
+        self._loop = None
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+from typing import Dict
+from . import kernels
+
+DEFAULT_FEE = 0.001        # 0.1% per side, Binance spot taker
+DEFAULT_SLIPPAGE = 0.0005  # fraction of price lost on every fill
+RESULT_KEYS = ('total_return', 'buy_hold_return', 'max_drawdown', 'trades', 'win_rate',
+               'avg_trade_return', 'best_trade', 'worst_trade', 'exposure')
+
+def _forward_fill(values: np.ndarray) -> np.ndarray:
+    """Replace NaNs with the last valid value before them (NaN until the first one)"""
+    index = np.where(np.isnan(values), 0, np.arange(len(values)))
+    np.maximum.accumulate(index, out=index)
+    return values[index]
+
+def backtest(close, volume, rsi_window: int, sma_short: int, sma_long: int, bb_window: int,
+             volume_spike_ratio: float, fee: float = DEFAULT_FEE,
+             slippage: float = DEFAULT_SLIPPAGE) -> Dict[str, float]:
+    """
+    Simulate the Analyzer signal rules over a candle history, without per-row loops.
+
+    A BUY signal opens a long position at that candle's close and a SELL
+    signal closes it; signals that don't change the position are ignored.
+    Every fill pays `fee` and loses `slippage` on the price. A position still
+    open on the last candle is closed there. An empty history returns all zeros.
+
+    Returns:
+        dict: total_return, buy_hold_return, max_drawdown, trades, win_rate,
+        avg_trade_return, best_trade, worst_trade, exposure (all fractions)
+    """
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    if not len(close):
+        return {**dict.fromkeys(RESULT_KEYS, 0.0), 'trades': 0}
+
+    values = kernels.indicators(
+        close, volume,
+        rsi_window=rsi_window, sma_short=sma_short, sma_long=sma_long,
+        bb_window=bb_window, volume_spike_ratio=volume_spike_ratio
+    )
+    values['close'] = close
+    buy, sell = kernels.signal_masks(values)
+
+    # 1 while long, 0 while flat, decided at each candle's close
+    state = np.full(len(close), np.nan)
+    state[buy] = 1.0
+    state[sell] = 0.0
+    state = np.nan_to_num(_forward_fill(state))
+    state[-1] = 0.0  # Liquidate at the end
+
+    change = np.diff(state, prepend=0.0)
+    entries = np.flatnonzero(change == 1)
+    exits = np.flatnonzero(change == -1)
+
+    entry_cost = (1 - fee) / (1 + slippage)
+    exit_cost = (1 - fee) * (1 - slippage)
+
+    growth = np.ones(len(close))
+    growth[1:] += state[:-1] * (close[1:] / close[:-1] - 1)
+    growth[entries] *= entry_cost
+    growth[exits] *= exit_cost
+    equity = np.cumprod(growth)
+    drawdown = equity / np.maximum.accumulate(equity) - 1
+
+    trade_returns = close[exits] / close[entries] * entry_cost * exit_cost - 1
+    return {
+        'total_return': float(equity[-1] - 1),
+        'buy_hold_return': float(close[-1] / close[0] - 1),
+        'max_drawdown': float(drawdown.min()),
+        'trades': int(len(trade_returns)),
+        'win_rate': float((trade_returns > 0).mean()) if len(trade_returns) else 0.0,
+        'avg_trade_return': float(trade_returns.mean()) if len(trade_returns) else 0.0,
+        'best_trade': float(trade_returns.max()) if len(trade_returns) else 0.0,
+        'worst_trade': float(trade_returns.min()) if len(trade_returns) else 0.0,
+        'exposure': float(state.mean()),
+    }
+
+class Backtester:
+    """Runs `backtest` with the indicator settings from Config"""
+
+    def __init__(self, config, fee: float = DEFAULT_FEE, slippage: float = DEFAULT_SLIPPAGE):
+        self.config = config
+        self.fee = fee
+        self.slippage = slippage
+
+    def run(self, df: pd.DataFrame) -> Dict[str, float]:
+        """Backtest an OHLCV DataFrame as returned by Exchange.get_ohlcv"""
+        return backtest(
+            df['close'].values, df['volume'].values,
+            rsi_window=self.config.RSI_WINDOW,
+            sma_short=self.config.SMA_SHORT,
+            sma_long=self.config.SMA_LONG,
+            bb_window=self.config.BB_WINDOW,
+            volume_spike_ratio=self.config.VOLUME_SPIKE_RATIO,
+            fee=self.fee,
+            slippage=self.slippage
+        )
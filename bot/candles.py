@@ -0,0 +1,125 @@
+import itertools
+import numpy as np
+import pandas as pd
+from typing import Optional
+
+def parse_ohlcv(rows) -> np.ndarray:
+    """ccxt's list of [timestamp, open, high, low, close, volume] as one (candles, 6) float64 array"""
+    if isinstance(rows, np.ndarray):
+        return rows.astype(np.float64, copy=False).reshape(-1, 6)
+    rows = rows if isinstance(rows, list) else list(rows)
+    # fromiter over the flattened rows is the cheapest way through Python floats
+    values = np.fromiter(itertools.chain.from_iterable(rows), np.float64, count=6 * len(rows))
+    return values.reshape(-1, 6)
+
+class CandleBuffer:
+    """
+    The newest `capacity` candles of one symbol/timeframe in preallocated arrays.
+
+    Timestamps stay int64 epoch milliseconds and open/high/low/close/volume
+    are float64 rows, each column one contiguous slice. Storage holds twice the
+    capacity so appends only write at the end; the live candles are moved back
+    to the front once every `capacity` appends. A DataFrame is only built when
+    `to_frame` is called.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._timestamps = np.zeros(2 * capacity, dtype=np.int64)
+        self._values = np.zeros((5, 2 * capacity), dtype=np.float64)
+        self._start = 0
+        self._end = 0
+
+    @classmethod
+    def from_rows(cls, rows, capacity: Optional[int] = None) -> "CandleBuffer":
+        rows = parse_ohlcv(rows)
+        buffer = cls(capacity or max(len(rows), 1))
+        buffer.extend(rows)
+        return buffer
+
+    def __len__(self):
+        return self._end - self._start
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self._timestamps[self._start:self._end]
+
+    @property
+    def open(self) -> np.ndarray:
+        return self._values[0, self._start:self._end]
+
+    @property
+    def high(self) -> np.ndarray:
+        return self._values[1, self._start:self._end]
+
+    @property
+    def low(self) -> np.ndarray:
+        return self._values[2, self._start:self._end]
+
+    @property
+    def close(self) -> np.ndarray:
+        return self._values[3, self._start:self._end]
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self._values[4, self._start:self._end]
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        return int(self._timestamps[self._end - 1]) if len(self) else None
+
+    def extend(self, rows):
+        """Append candles (oldest first), dropping the oldest beyond capacity"""
+        rows = parse_ohlcv(rows)[-self.capacity:]
+        n = len(rows)
+        if not n:
+            return
+        if self._end + n > len(self._timestamps):
+            keep = min(len(self), self.capacity - n)
+            self._timestamps[:keep] = self._timestamps[self._end - keep:self._end]
+            self._values[:, :keep] = self._values[:, self._end - keep:self._end]
+            self._start, self._end = 0, keep
+
+        self._timestamps[self._end:self._end + n] = rows[:, 0]
+        self._values[:, self._end:self._end + n] = rows[:, 1:].T
+        self._end += n
+        self._start = max(self._start, self._end - self.capacity)
+
+    def merge(self, rows):
+        """
+        Apply freshly fetched candles: one with the same timestamp as the
+        newest held candle replaces it (it was still forming), newer ones are
+        appended and older ones ignored.
+        """
+        rows = parse_ohlcv(rows)
+        last = self.last_timestamp
+        if last is not None:
+            rows = rows[rows[:, 0] >= last]
+            if len(rows) and rows[0, 0] == last:
+                self._values[:, self._end - 1] = rows[0, 1:]
+                rows = rows[1:]
+        self.extend(rows)
+
+    def to_array(self) -> np.ndarray:
+        """Copy of the candles as a (candles, 6) float64 array, ccxt's column order"""
+        array = np.empty((len(self), 6))
+        array[:, 0] = self.timestamps
+        array[:, 1:] = self._values[:, self._start:self._end].T
+        return array
+
+    def to_frame(self, symbol: Optional[str] = None) -> pd.DataFrame:
+        """
+        OHLCV DataFrame with datetime timestamps. pandas copies the arrays, so
+        later updates don't change it. The symbol goes in df.attrs['symbol']
+        instead of a per-row column.
+        """
+        df = pd.DataFrame({
+            "timestamp": self.timestamps.astype("datetime64[ms]"),
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+            "close": self.close,
+            "volume": self.volume,
+        })
+        df.attrs['symbol'] = symbol
+        return df
@@ -1,11 +1,14 @@
 import csv
 import os
 from pathlib import Path
+from types import SimpleNamespace
 from typing import List, Dict, Any
 
+PROJECT_DIR = Path(__file__).parent.parent  # config.csv, cache/ and relative paths in the settings live here
+
 class Config:
     def __init__(self):
-        self.config_path = Path(__file__).parent.parent / "config.csv"
+        self.config_path = PROJECT_DIR / "config.csv"
         self.default_config = {
             "TELEGRAM_TOKEN": "",
             "TELEGRAM_CHAT_ID": "",
@@ -18,7 +21,36 @@ class Config:
             "BB_WINDOW": "20",
             "VOLUME_SPIKE_RATIO": "1.5",
             "EXCHANGE": "binance",
-            "THEME": "light"
+            "THEME": "light",
+            "ANALYZER_BACKEND": "ta",
+            "SCHEDULE_MODE": "interval",
+            "CANDLE_CLOSE_DELAY_MS": "300",
+            "CANDLE_REFRESH_INTERVAL": "0",
+            "NOTIFY_QUEUE_SIZE": "100",
+            "NOTIFY_BATCH_SIZE": "5",
+            "NOTIFY_MAX_RETRIES": "3",
+            "NOTIFY_ON_CHANGE": "1",
+            "PRICE_CHANGE_PCT": "1.0",
+            "HEARTBEAT_INTERVAL": "3600",
+            "LOG_MAX_LINES": "1000",
+            "SCAN_MODE": "0",
+            "SCAN_MIN_QUOTE_VOLUME": "1000000",
+            "SCAN_MIN_CHANGE_PCT": "0",
+            "SCAN_MAX_PAIRS": "400",
+            "SCAN_CONCURRENCY": "20",
+            "ANALYSIS_CACHE_MB": "16",
+            "CONFIRM_TIMEFRAMES": "",
+            "WATCHLIST": "",
+            "FETCH_WORKERS": "4",
+            "ANALYSIS_WORKERS": "2",
+            "NOTIFY_WORKERS": "1",
+            "PIPELINE_QUEUE_SIZE": "100",
+            "SHARD_WORKERS": "0",
+            "METRICS_PORT": "0",
+            "PROFILE_CYCLES": "5",
+            "PROFILE_TOP": "10",
+            "PROFILE_DIR": "profiles",
+            "PROFILE_TRIGGER_FILE": "profile.request"
         }
         self.config = self.default_config.copy()
         self._load_config()
@@ -73,12 +105,24 @@ class Config:
     def available_pairs(self, pairs: List[str]):
         self._available_pairs = sorted(pairs)
 
+    def snapshot(self) -> SimpleNamespace:
+        """Typed copy of the current settings that can be pickled to worker processes"""
+        return SimpleNamespace(**{key: getattr(self, key) for key in self.config})
+
     def __getattr__(self, name):
         if name in self.config:
             # Convert numeric values to appropriate types
-            if name in ["INTERVAL", "RSI_WINDOW", "SMA_SHORT", "SMA_LONG", "BB_WINDOW"]:
+            if name in ["INTERVAL", "RSI_WINDOW", "SMA_SHORT", "SMA_LONG", "BB_WINDOW",
+                        "CANDLE_CLOSE_DELAY_MS", "CANDLE_REFRESH_INTERVAL",
+                        "NOTIFY_QUEUE_SIZE", "NOTIFY_BATCH_SIZE", "NOTIFY_MAX_RETRIES",
+                        "NOTIFY_ON_CHANGE", "HEARTBEAT_INTERVAL", "LOG_MAX_LINES",
+                        "SCAN_MODE", "SCAN_MAX_PAIRS", "SCAN_CONCURRENCY",
+                        "FETCH_WORKERS", "ANALYSIS_WORKERS", "NOTIFY_WORKERS", "PIPELINE_QUEUE_SIZE",
+                        "SHARD_WORKERS", "METRICS_PORT",
+                        "PROFILE_CYCLES", "PROFILE_TOP"]:
                 return int(self.config[name])
-            elif name in ["VOLUME_SPIKE_RATIO"]:
+            elif name in ["VOLUME_SPIKE_RATIO", "PRICE_CHANGE_PCT",
+                          "SCAN_MIN_QUOTE_VOLUME", "SCAN_MIN_CHANGE_PCT", "ANALYSIS_CACHE_MB"]:
                 return float(self.config[name])
             return self.config[name]
         raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
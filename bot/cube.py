@@ -0,0 +1,112 @@
+import numpy as np
+from typing import Dict, Sequence
+from . import kernels
+
+# Every window the SettingsWindow spinboxes can select
+SMA_WINDOWS = range(5, 51)  # Short MA 5-20 and Long MA 20-50
+BB_WINDOWS = range(10, 51)
+RSI_WINDOWS = range(5, 31)
+
+def _window_sums(values: np.ndarray, windows: np.ndarray) -> np.ndarray:
+    """Trailing sums for every window in one pass, shape (windows, candles), NaN until a window is full"""
+    cumsum = np.zeros(len(values) + 1)
+    np.cumsum(values, out=cumsum[1:])
+    end = np.arange(1, len(values) + 1)
+    start = end - windows[:, None]
+    sums = cumsum[end] - cumsum[np.maximum(start, 0)]
+    sums[start < 0] = np.nan
+    return sums
+
+class IndicatorCube:
+    """
+    The window-dependent indicators for every spinbox value, precomputed over one candle history.
+
+    SMAs and Bollinger mean/std for all windows come from a single cumulative
+    sum (of values shifted by their mean, to keep it precise), and the RSI for
+    all windows from one Wilder smoothing pass with a per-row alpha. Picking a
+    setting afterwards is only a row lookup, so signal previews are instant.
+    """
+
+    def __init__(self, close, volume, sma_windows: Sequence[int] = SMA_WINDOWS,
+                 bb_windows: Sequence[int] = BB_WINDOWS, rsi_windows: Sequence[int] = RSI_WINDOWS):
+        self.close = np.ascontiguousarray(close, dtype=np.float64)
+        self.volume = np.ascontiguousarray(volume, dtype=np.float64)
+        self.sma_windows = np.asarray(list(sma_windows))
+        self.bb_windows = np.asarray(list(bb_windows))
+        self.rsi_windows = np.asarray(list(rsi_windows))
+
+        anchor = self.close.mean() if len(self.close) else 0.0
+        shifted = self.close - anchor
+        self._sma = anchor + _window_sums(shifted, self.sma_windows) / self.sma_windows[:, None]
+
+        offset = _window_sums(shifted, self.bb_windows) / self.bb_windows[:, None]
+        mean_sq = _window_sums(shifted * shifted, self.bb_windows) / self.bb_windows[:, None]
+        self._bb_mean = anchor + offset
+        self._bb_std = np.sqrt(np.maximum(mean_sq - offset * offset, 0.0))
+
+        change = np.zeros(len(self.close))
+        change[1:] = np.diff(self.close)
+        moves = np.stack([np.maximum(change, 0.0), np.maximum(-change, 0.0)])
+        moves = np.broadcast_to(moves[:, None, :], (2, len(self.rsi_windows), len(self.close)))
+        avg_gain, avg_loss = kernels.ema(moves, 1 / self.rsi_windows, self.rsi_windows)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self._rsi = np.where(avg_loss == 0, 100.0, 100 - 100 / (1 + avg_gain / avg_loss))
+        self._rsi[np.isnan(avg_loss)] = np.nan
+
+        # Not tied to any setting, computed once
+        self.macd, self.macd_signal = kernels.macd(self.close)
+        self.avg_volume = kernels.sma(self.volume, 10)
+
+    @staticmethod
+    def _row(windows: np.ndarray, window: int) -> int:
+        rows = np.flatnonzero(windows == window)
+        if not len(rows):
+            raise ValueError(f"Window {window} is outside the precomputed range {windows[0]}-{windows[-1]}")
+        return int(rows[0])
+
+    def sma(self, window: int) -> np.ndarray:
+        return self._sma[self._row(self.sma_windows, window)]
+
+    def rolling_std(self, window: int) -> np.ndarray:
+        return self._bb_std[self._row(self.bb_windows, window)]
+
+    def bollinger(self, window: int, dev: float = 2):
+        row = self._row(self.bb_windows, window)
+        return self._bb_mean[row] + dev * self._bb_std[row], self._bb_mean[row] - dev * self._bb_std[row]
+
+    def rsi(self, window: int) -> np.ndarray:
+        return self._rsi[self._row(self.rsi_windows, window)]
+
+    def values(self, rsi_window: int, sma_short: int, sma_long: int, bb_window: int,
+               volume_spike_ratio: float) -> Dict[str, np.ndarray]:
+        """Indicator arrays for one set of settings, keyed like kernels.indicators"""
+        bb_upper, bb_lower = self.bollinger(bb_window)
+        return {
+            'close': self.close,
+            'rsi': self.rsi(rsi_window),
+            'ma_short': self.sma(sma_short),
+            'ma_long': self.sma(sma_long),
+            'macd': self.macd,
+            'macd_signal': self.macd_signal,
+            'bb_upper': bb_upper,
+            'bb_lower': bb_lower,
+            'avg_volume': self.avg_volume,
+            'volume_spike': kernels.volume_spike(self.volume, self.avg_volume, volume_spike_ratio),
+        }
+
+    def signals(self, **settings) -> np.ndarray:
+        """BUY/SELL/HOLD for every candle under the given settings"""
+        buy, sell = kernels.signal_masks(self.values(**settings))
+        return np.where(buy, "BUY", np.where(sell, "SELL", "HOLD"))
+
+    def preview(self, **settings) -> Dict:
+        """
+        Returns:
+            dict: buy and sell signal counts over the history and the latest signal
+        """
+        signals = self.signals(**settings)
+        return {
+            'buy': int((signals == "BUY").sum()),
+            'sell': int((signals == "SELL").sum()),
+            'latest': str(signals[-1]) if len(signals) else "HOLD",
+        }
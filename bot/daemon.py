@@ -0,0 +1,57 @@
+import logging
+import signal
+import sys
+import threading
+import time
+from typing import Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DRAIN_INTERVAL = 0.5  # seconds between flushes of bot events to the log
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident memory of this process in MB, None where it can't be measured"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def startup_report(mode: str, started_at: float) -> str:
+    rss = peak_rss_mb()
+    memory = f"{rss:.1f} MB" if rss is not None else "n/a"
+    return f"Startup ({mode}): {(time.perf_counter() - started_at) * 1000:.0f} ms, peak RSS {memory}"
+
+def run_headless(bot_manager, started_at: float, log_file: Optional[str] = None):
+    """
+    Run the bot without Tk, writing its events to log_file (or stderr) until
+    interrupted with Ctrl+C or SIGTERM.
+    """
+    handler = logging.FileHandler(log_file) if log_file else logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+    logger = logging.getLogger("creepybot")
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+
+    stop = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop.set())
+
+    bot_manager.start()
+    logger.info(startup_report("headless", started_at))
+
+    def flush():
+        logs, _, _ = bot_manager.events.drain()
+        for level, message in logs:
+            logger.log(logging.ERROR if level == "ERROR" else logging.INFO, message)
+
+    while not stop.wait(DRAIN_INTERVAL):
+        flush()
+
+    bot_manager.stop()
+    bot_manager.notification_queue.stop()  # Wait for queued BUY/SELL messages to go out
+    flush()  # Events of the last cycle, posted while stopping
+    logger.info("Bot stopped")
@@ -0,0 +1,47 @@
+import threading
+from collections import deque
+from typing import List, Optional, Tuple
+
+class EventChannel:
+    """
+    Hands UI updates from worker threads to whoever renders them.
+
+    Workers publish without ever touching Tk; the UI thread drains the channel
+    on its own timer. Log lines are kept in order (bounded, oldest dropped
+    first), while stats and signal updates are coalesced so only the newest
+    one is rendered per drain.
+    """
+
+    def __init__(self, max_pending_logs: int = 1000):
+        self._lock = threading.Lock()
+        self._logs = deque(maxlen=max_pending_logs)
+        self._stats: Optional[dict] = None
+        self._signal: Optional[str] = None
+        self.published = 0
+        self.dropped_logs = 0
+
+    def log(self, message: str, level: str = "INFO"):
+        with self._lock:
+            if len(self._logs) == self._logs.maxlen:
+                self.dropped_logs += 1
+            self._logs.append((level, message))
+            self.published += 1
+
+    def stats(self, data: dict):
+        with self._lock:
+            self._stats = data
+            self.published += 1
+
+    def signal(self, signal: str):
+        with self._lock:
+            self._signal = signal
+            self.published += 1
+
+    def drain(self) -> Tuple[List[Tuple[str, str]], Optional[dict], Optional[str]]:
+        """Take everything published since the last drain: (log lines, latest stats, latest signal)"""
+        with self._lock:
+            logs = list(self._logs)
+            self._logs.clear()
+            stats, self._stats = self._stats, None
+            signal, self._signal = self._signal, None
+        return logs, stats, signal
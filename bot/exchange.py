@@ -1,38 +1,170 @@
 import ccxt
+import json
+import os
+import tempfile
+import threading
+import time
+import numpy as np
 import pandas as pd
-from typing import List
+from pathlib import Path
+from typing import List, Optional
+from .candles import CandleBuffer
+
+MARKET_CACHE_DIR = Path(__file__).parent.parent / "cache"
+MARKET_CACHE_TTL = 6 * 60 * 60  # seconds before the cached market table is refreshed
+
+def ohlcv_frame(ohlcv, symbol: str) -> pd.DataFrame:
+    """Build the OHLCV DataFrame Analyzer expects from ccxt's list of candles"""
+    return CandleBuffer.from_rows(ohlcv).to_frame(symbol)
 
 class Exchange:
-    def __init__(self, exchange_name='binance'):
+    def __init__(self, exchange_name='binance', market_cache_ttl: int = MARKET_CACHE_TTL):
+        self.exchange_name = exchange_name
         self.exchange = getattr(ccxt, exchange_name)({
             'enableRateLimit': True
         })
         self.supported_pairs = []
+        self.market_cache_ttl = market_cache_ttl
+        self.markets_load_time = 0.0
+        # (symbol, timeframe) -> ring buffer of candles, the last one may still be forming
+        self._candles = {}
+        self._candle_locks = {}  # (symbol, timeframe) -> lock held while its buffer is updated or read
+        self._candle_locks_guard = threading.Lock()
         self._load_supported_pairs()
 
-    def _load_supported_pairs(self):
+    def _load_supported_pairs(self, force_refresh: bool = False):
+        """Load pairs from the on-disk cache, hitting the exchange only when it is missing or stale"""
+        start = time.perf_counter()
+        cached = None if force_refresh else self._read_market_cache()
+
+        if cached is None:
+            self._refresh_supported_pairs()
+        else:
+            self.supported_pairs, age = cached
+            if age > self.market_cache_ttl:
+                # Serve the stale snapshot now and replace it once the exchange answers
+                threading.Thread(target=self._refresh_supported_pairs, daemon=True).start()
+
+        self.markets_load_time = time.perf_counter() - start
+        source = "exchange" if cached is None else "cache"
+        print(f"Loaded {len(self.supported_pairs)} pairs from {source} in {self.markets_load_time * 1000:.0f} ms")
+
+    def _refresh_supported_pairs(self):
         try:
-            markets = self.exchange.load_markets()
+            markets = self.exchange.load_markets(reload=True)
             self.supported_pairs = sorted([
                 symbol for symbol in markets.keys() 
                 if symbol.endswith('/USDT') and markets[symbol]['active']
             ])
+            self._write_market_cache()
         except Exception as e:
             print(f"Error loading markets: {e}")
 
+    @property
+    def _market_cache_path(self) -> Path:
+        return MARKET_CACHE_DIR / f"markets_{self.exchange_name}.json"
+
+    def _read_market_cache(self) -> Optional[tuple]:
+        """Return (pairs, age in seconds) from the cache file, or None if it can't be used"""
+        try:
+            with open(self._market_cache_path, mode='r') as file:
+                snapshot = json.load(file)
+            return snapshot["pairs"], time.time() - snapshot["saved_at"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _write_market_cache(self):
+        try:
+            MARKET_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            # One temp file per writer, shard workers save the same cache at the same time
+            with tempfile.NamedTemporaryFile(mode='w', dir=MARKET_CACHE_DIR, prefix=self._market_cache_path.stem,
+                                             suffix=".tmp", delete=False) as file:
+                json.dump({"saved_at": time.time(), "pairs": self.supported_pairs}, file)
+            try:
+                os.replace(file.name, self._market_cache_path)
+            except OSError:
+                os.remove(file.name)
+                raise
+        except OSError as e:
+            print(f"Error saving market cache: {e}")
+
     def get_ohlcv(self, symbol: str, timeframe: str, limit: int = 100) -> pd.DataFrame:
         if not self.is_pair_supported(symbol):
             raise ValueError(f"Pair {symbol} not supported")
         
         try:
-            ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe=timeframe, limit=limit)
-            df = pd.DataFrame(ohlcv, columns=["timestamp", "open", "high", "low", "close", "volume"])
-            df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
-            df["symbol"] = symbol  # Add symbol column
-            return df
+            with self._candle_lock(symbol, timeframe):
+                return self._update_candles(symbol, timeframe, limit).to_frame(symbol)
+        except Exception as e:
+            raise Exception(f"Error fetching data: {e}")
+
+    def get_candles(self, symbol: str, timeframe: str, limit: int = 100) -> np.ndarray:
+        """Up to date candles as a (candles, 6) array, for callers that don't need a DataFrame"""
+        if not self.is_pair_supported(symbol):
+            raise ValueError(f"Pair {symbol} not supported")
+        with self._candle_lock(symbol, timeframe):
+            return self._update_candles(symbol, timeframe, limit).to_array()
+
+    def _candle_lock(self, symbol: str, timeframe: str) -> threading.Lock:
+        with self._candle_locks_guard:
+            return self._candle_locks.setdefault((symbol, timeframe), threading.Lock())
+
+    def _update_candles(self, symbol: str, timeframe: str, limit: int) -> CandleBuffer:
+        """
+        Bring the candle buffer up to date, only requesting candles we don't
+        have yet. Callers hold the pair's _candle_lock, so two threads never
+        merge into the same buffer.
+        """
+        key = (symbol, timeframe)
+        candles = self._candles.get(key)
+        timeframe_ms = self.exchange.parse_timeframe(timeframe) * 1000
+
+        # Full download on first use, when the limit changed or when we fell too far behind
+        if not candles or candles.capacity != limit or \
+                self.exchange.milliseconds() - candles.last_timestamp > timeframe_ms * (limit - 1):
+            candles = CandleBuffer(limit)
+            candles.extend(self.exchange.fetch_ohlcv(symbol, timeframe=timeframe, limit=limit))
+            self._candles[key] = candles
+            return candles
+
+        # The newest stored candle may still be forming, so it is requested again and replaced
+        since = candles.last_timestamp
+        candles.merge(self.exchange.fetch_ohlcv(symbol, timeframe=timeframe, since=since, limit=limit))
+        return candles
+
+    def fetch_history(self, symbol: str, timeframe: str, limit: int = 100) -> list:
+        """Raw OHLCV rows straight from the exchange, outside the candle buffers"""
+        try:
+            return self.exchange.fetch_ohlcv(symbol, timeframe=timeframe, limit=limit)
         except Exception as e:
             raise Exception(f"Error fetching data: {e}")
 
+    def get_cached_ohlcv(self, symbol: str, timeframe: str) -> Optional[np.ndarray]:
+        """Candles already held for symbol/timeframe as a (candles, 6) array, without fetching"""
+        with self._candle_lock(symbol, timeframe):  # A fetch may be merging into the buffer on another thread
+            candles = self._candles.get((symbol, timeframe))
+            if not candles:
+                return None
+            return candles.to_array()
+
+    def get_tickers(self, symbols: Optional[List[str]] = None) -> dict:
+        """24h tickers for many symbols in one request"""
+        try:
+            return self.exchange.fetch_tickers(symbols)
+        except Exception as e:
+            raise Exception(f"Error fetching tickers: {e}")
+
+    def get_clock_offset(self) -> int:
+        """Exchange clock minus local clock in milliseconds, 0 if the exchange can't tell"""
+        try:
+            sent = self.exchange.milliseconds()
+            server_time = self.exchange.fetch_time()
+            received = self.exchange.milliseconds()
+            return int(server_time - (sent + received) / 2) if server_time else 0
+        except Exception as e:
+            print(f"Error fetching server time: {e}")
+            return 0
+
     def is_pair_supported(self, symbol: str) -> bool:
         return symbol in self.supported_pairs
 
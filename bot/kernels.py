@@ -0,0 +1,221 @@
+import math
+import numpy as np
+from typing import Dict, Tuple
+
+# Vectorized versions of the `ta` indicators used by Analyzer.
+# All kernels take contiguous float64 arrays and work along the last axis,
+# returning NaN wherever `ta` (with fillna=False) would.
+
+
+def _as_float_array(values) -> np.ndarray:
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+def _ema_filter(values: np.ndarray, alpha) -> np.ndarray:
+    """
+    y[0] = x[0], y[t] = y[t-1] + alpha * (x[t] - y[t-1]) along the last axis.
+
+    The recursion is solved in sqrt(n) blocks: every block is filtered from a
+    zero state in parallel, then the block start states are chained and
+    added back with the matching decay, so Python only loops 2 * sqrt(n) times.
+    `alpha` is a scalar or one value per row.
+    """
+    n = values.shape[-1]
+    lead = values.shape[:-1]
+    alpha = np.broadcast_to(np.asarray(alpha, dtype=np.float64), lead)
+    block = math.isqrt(n - 1) + 1 if n else 1
+    n_blocks = -(-n // block)
+    decay = 1.0 - alpha
+
+    # Lay blocks out as (position in block, block) so every step below touches contiguous memory
+    padded = np.zeros(lead + (n_blocks * block,))
+    padded[..., :n] = values
+    local = np.ascontiguousarray(padded.reshape(lead + (n_blocks, block)).swapaxes(-1, -2))
+    local *= alpha[..., None, None]
+    row_decay = decay[..., None]
+    for i in range(1, block):
+        local[..., i, :] += row_decay * local[..., i - 1, :]
+
+    starts = np.empty(lead + (n_blocks,))
+    state = values[..., 0] if n else np.zeros(lead)  # y[-1] = x[0] reproduces y[0] = x[0]
+    block_decay = decay ** block
+    for j in range(n_blocks):
+        starts[..., j] = state
+        state = local[..., -1, j] + block_decay * state
+
+    powers = decay[..., None] ** np.arange(1, block + 1)
+    local += starts[..., None, :] * powers[..., None]
+    return local.swapaxes(-1, -2).reshape(lead + (n_blocks * block,))[..., :n]
+
+
+def ema(values, alpha, min_periods) -> np.ndarray:
+    """
+    pandas ewm(alpha=alpha, adjust=False, min_periods=min_periods).mean(), skipping leading NaNs.
+
+    `alpha` and `min_periods` are scalars or one value per row.
+    """
+    values = _as_float_array(values)
+    n = values.shape[-1]
+    if n == 0:
+        return values.copy()
+    valid = ~np.isnan(values)
+    first = np.where(valid.any(axis=-1), valid.argmax(axis=-1), n)
+
+    index = np.arange(n)
+    if (first > 0).any():
+        # Leading NaNs take the first valid value, which leaves the EMA seeded exactly at that value
+        seed = np.take_along_axis(values, np.minimum(first, n - 1)[..., None], axis=-1)
+        values = np.where(index < first[..., None], seed, values)
+
+    result = _ema_filter(values, alpha)
+    cut = np.broadcast_to(first + np.asarray(min_periods) - 1, first.shape)
+    if (cut == cut.flat[0]).all():
+        result[..., :max(int(cut.flat[0]), 0)] = np.nan
+    else:
+        result[index < cut[..., None]] = np.nan
+    return result
+
+
+_CHUNK = 1024
+
+
+def _rolling_sums(values: np.ndarray, window: int, squares: bool = True):
+    """
+    Sums of (x - anchor) and, if asked, (x - anchor)**2 for every full window, plus the anchors.
+
+    Cumulative sums restart from a local anchor every _CHUNK windows, which
+    keeps them small and the window sums as precise as a direct summation.
+    """
+    n = values.shape[-1]
+    lead = values.shape[:-1]
+    count = n - window + 1
+    chunk = min(_CHUNK, count)
+    n_chunks = -(-count // chunk)
+    span = chunk + window - 1
+
+    padded = np.empty(lead + ((n_chunks - 1) * chunk + span,))
+    padded[..., :n] = values
+    padded[..., n:] = values[..., -1:]
+    chunks = np.lib.stride_tricks.sliding_window_view(padded, span, axis=-1)[..., ::chunk, :]
+    anchors = chunks[..., :1]
+    shifted = chunks - anchors
+
+    sums = [None, None]
+    for k, terms in enumerate((shifted, shifted * shifted if squares else None)):
+        if terms is None:
+            continue
+        cumsum = np.zeros(terms.shape[:-1] + (span + 1,))
+        np.cumsum(terms, axis=-1, out=cumsum[..., 1:])
+        window_sums = cumsum[..., window:window + chunk] - cumsum[..., :chunk]
+        sums[k] = window_sums.reshape(lead + (n_chunks * chunk,))[..., :count]
+    anchors = np.broadcast_to(anchors, lead + (n_chunks, chunk)).reshape(lead + (n_chunks * chunk,))[..., :count]
+    return sums[0], sums[1], anchors
+
+
+def sma(values, window: int) -> np.ndarray:
+    """Rolling mean over `window` values, NaN until the window is full"""
+    values = _as_float_array(values)
+    result = np.full(values.shape, np.nan)
+    if values.shape[-1] >= window:
+        total, _, anchors = _rolling_sums(values, window, squares=False)
+        result[..., window - 1:] = anchors + total / window
+    return result
+
+
+def rolling_mean_std(values, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Rolling mean and population standard deviation (ddof=0), NaN until the window is full"""
+    values = _as_float_array(values)
+    mean = np.full(values.shape, np.nan)
+    std = np.full(values.shape, np.nan)
+    if values.shape[-1] >= window:
+        total, total_sq, anchors = _rolling_sums(values, window)
+        offset = total / window
+        mean[..., window - 1:] = anchors + offset
+        std[..., window - 1:] = np.sqrt(np.maximum(total_sq / window - offset * offset, 0.0))
+    return mean, std
+
+
+def wilder_averages(close, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Wilder-smoothed average gain and loss behind the RSI"""
+    close = _as_float_array(close)
+    change = np.zeros(close.shape)
+    change[..., 1:] = np.diff(close, axis=-1)
+    # Gains and losses are smoothed in one pass
+    avg_gain, avg_loss = ema(np.stack([np.maximum(change, 0.0), np.maximum(-change, 0.0)]), 1 / window, window)
+    return avg_gain, avg_loss
+
+
+def rsi(close, window: int) -> np.ndarray:
+    """Wilder RSI as computed by ta.momentum.RSIIndicator"""
+    avg_gain, avg_loss = wilder_averages(close, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = np.where(avg_loss == 0, 100.0, 100 - 100 / (1 + avg_gain / avg_loss))
+    result[np.isnan(avg_loss)] = np.nan
+    return result
+
+
+MACD_FAST, MACD_SLOW, MACD_SIGN = 12, 26, 9
+
+
+def macd_emas(close, fast: int = MACD_FAST, slow: int = MACD_SLOW) -> Tuple[np.ndarray, np.ndarray]:
+    """Fast and slow EMAs whose difference is the MACD line"""
+    close = _as_float_array(close)
+    periods = np.array([fast, slow]).reshape((2,) + (1,) * (close.ndim - 1))
+    ema_fast, ema_slow = ema(np.stack([close, close]), 2 / (periods + 1), periods)
+    return ema_fast, ema_slow
+
+
+def macd(close, fast: int = MACD_FAST, slow: int = MACD_SLOW, sign: int = MACD_SIGN) -> Tuple[np.ndarray, np.ndarray]:
+    """MACD line and signal line as computed by ta.trend.MACD"""
+    ema_fast, ema_slow = macd_emas(close, fast, slow)
+    line = ema_fast - ema_slow
+    return line, ema(line, 2 / (sign + 1), sign)
+
+
+def bollinger(close, window: int, dev: float = 2) -> Tuple[np.ndarray, np.ndarray]:
+    """Upper and lower Bollinger bands as computed by ta.volatility.BollingerBands"""
+    middle, std = rolling_mean_std(close, window)
+    return middle + dev * std, middle - dev * std
+
+
+def volume_spike(volume, avg_volume, ratio: float) -> np.ndarray:
+    return _as_float_array(volume) > avg_volume * ratio
+
+
+def indicators(close, volume, rsi_window: int, sma_short: int, sma_long: int,
+               bb_window: int, volume_spike_ratio: float) -> Dict[str, np.ndarray]:
+    """All Analyzer indicators, keyed like the DataFrame columns Analyzer adds"""
+    close = _as_float_array(close)
+    volume = _as_float_array(volume)
+    macd_line, macd_signal = macd(close)
+    bb_upper, bb_lower = bollinger(close, bb_window)
+    avg_volume = sma(volume, 10)
+    return {
+        'rsi': rsi(close, rsi_window),
+        'ma_short': sma(close, sma_short),
+        'ma_long': sma(close, sma_long),
+        'macd': macd_line,
+        'macd_signal': macd_signal,
+        'bb_upper': bb_upper,
+        'bb_lower': bb_lower,
+        'avg_volume': avg_volume,
+        'volume_spike': volume_spike(volume, avg_volume, volume_spike_ratio),
+    }
+
+
+def signal_masks(values: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized Analyzer._generate_signal.
+
+    Args:
+        values: Arrays keyed like Analyzer's columns ('close', 'rsi', 'ma_short', ...)
+
+    Returns:
+        (buy, sell) boolean arrays, NaN indicators never trigger either
+    """
+    close, ma_short, ma_long = values['close'], values['ma_short'], values['ma_long']
+    macd_line, macd_signal = values['macd'], values['macd_signal']
+    spike = values['volume_spike']
+    buy = (values['rsi'] < 30) & (close > ma_short) & (ma_short > ma_long) & (macd_line > macd_signal) & spike
+    sell = (values['rsi'] > 70) & (close < ma_short) & (ma_short < ma_long) & (macd_line < macd_signal) & spike
+    return buy, sell
@@ -1,10 +1,52 @@
 import requests
-from typing import Optional
-from requests.exceptions import RequestException
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from typing import Dict, Optional
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError, HTTPError, RequestException, RetryError, Timeout
+from urllib3.util.retry import Retry
+
+TELEGRAM_API_URL = "https://api.telegram.org"
+TELEGRAM_MAX_LENGTH = 4096
+
+# Notifier.send results: FAILED won't succeed on a retry (bad token or chat, rejected message)
+SENT, RETRY, FAILED = "sent", "retry", "failed"
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+def get_session() -> requests.Session:
+    """
+    Keep-alive session shared by every Notifier in the process.
+
+    It lives at module level so the connection pool survives Notifier being
+    rebuilt on every settings change.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(
+                total=2,
+                read=0,  # A request that reached Telegram may have been delivered, don't resend it
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset(["POST"]),
+                backoff_factor=0.5,
+                respect_retry_after_header=True,
+                raise_on_status=False  # Hand back the last response, send() classifies its status
+            )
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=retry)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
 
 class Notifier:
-    def __init__(self, config):
+    def __init__(self, config, api_url: str = TELEGRAM_API_URL):
         self.config = config
+        self.api_url = api_url
 
     def send_telegram(self, message: str, parse_mode: Optional[str] = None) -> bool:
         """
@@ -17,16 +59,26 @@ class Notifier:
         Returns:
             bool: True if message was sent successfully, False otherwise
         """
+        return self.send(message, parse_mode) == SENT
+
+    def send(self, message: str, parse_mode: Optional[str] = None) -> str:
+        """
+        Send a message to a Telegram chat.
+
+        Returns:
+            str: SENT, RETRY for connection errors, timeouts, 429 and 5xx
+                 responses, or FAILED when retrying can't help
+        """
         # Check if config has required keys
         if not hasattr(self.config, 'TELEGRAM_TOKEN') or not hasattr(self.config, 'TELEGRAM_CHAT_ID'):
             print("❌ Telegram config missing: Need TELEGRAM_TOKEN and TELEGRAM_CHAT_ID")
-            return False
+            return FAILED
 
         if not all([self.config.TELEGRAM_TOKEN, self.config.TELEGRAM_CHAT_ID]):
             print("❌ Telegram config empty (check .env or config file)")
-            return False
+            return FAILED
 
-        url = f"https://api.telegram.org/bot{self.config.TELEGRAM_TOKEN}/sendMessage"
+        url = f"{self.api_url}/bot{self.config.TELEGRAM_TOKEN}/sendMessage"
         payload = {
             "chat_id": self.config.TELEGRAM_CHAT_ID,
             "text": message,
@@ -37,13 +89,139 @@ class Notifier:
             payload['parse_mode'] = parse_mode
 
         try:
-            response = requests.post(url, json=payload, timeout=10)
+            response = get_session().post(url, json=payload, timeout=10)
             response.raise_for_status()
             print("✅ Telegram message sent successfully")
-            return True
+            return SENT
+        except HTTPError as e:
+            print(f"❌ Telegram API error: {e}")
+            status = e.response.status_code if e.response is not None else 0
+            return RETRY if status == 429 or status >= 500 else FAILED
+        except (ConnectionError, Timeout, RetryError) as e:
+            print(f"❌ Telegram API error: {e}")
+            return RETRY
         except RequestException as e:
             print(f"❌ Telegram API error: {e}")
-            return False
+            return FAILED
+
+class NotificationQueue:
+    """
+    Bounded message queue drained by a background worker, so callers never wait on Telegram.
+
+    Queued messages are batched into one Telegram message when possible and
+    failed sends are retried with exponential backoff. When the queue is full
+    the oldest HOLD message is dropped; BUY and SELL messages are never dropped.
+    """
+
+    def __init__(self, notifier: Notifier, max_size: int = 100, batch_size: int = 5,
+                 max_retries: int = 3, retry_delay: float = 1.0):
+        self.notifier = notifier
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.stats = {"enqueued": 0, "sent": 0, "dropped": 0, "retries": 0, "failed": 0, "max_depth": 0}
+        self._items = deque()  # (signal, message)
+        self._condition = threading.Condition()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._worker_running = False  # Changed under _condition, the worker clears it as it exits
+        self.on_send = None  # on_send(seconds, ok), called after every send attempt
+        self.send_context = nullcontext  # send_context() wraps each send attempt, e.g. a profiler section
+
+    def start(self):
+        with self._condition:
+            self._stop_event.clear()
+            if self._worker_running:
+                return  # A worker still flushing after stop() just carries on
+            self._worker_running = True
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the worker after it has flushed what is already queued, waiting up to `timeout`"""
+        with self._condition:
+            self._stop_event.set()
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if not self._thread.is_alive():
+                self._thread = None
+
+    def put(self, message: str, signal: str = "HOLD") -> bool:
+        """Queue a message, returns False if it was dropped because the queue is full"""
+        with self._condition:
+            if len(self._items) >= self.max_size and not self._make_room(signal):
+                self.stats["dropped"] += 1
+                return False
+            self._items.append((signal, message))
+            self.stats["enqueued"] += 1
+            self.stats["max_depth"] = max(self.stats["max_depth"], len(self._items))
+            self._condition.notify()
+        return True
+
+    def _make_room(self, signal: str) -> bool:
+        for i, (queued_signal, _) in enumerate(self._items):
+            if queued_signal == "HOLD":
+                del self._items[i]
+                self.stats["dropped"] += 1
+                return True
+        # Only BUY/SELL left: they go over the limit rather than being lost
+        return signal in ("BUY", "SELL")
+
+    @property
+    def depth(self) -> int:
+        return len(self._items)
+
+    def metrics(self) -> Dict[str, int]:
+        with self._condition:
+            return {**self.stats, "depth": len(self._items)}
+
+    def _next_batch(self):
+        """Wait for messages and pop as many as fit in one Telegram message"""
+        with self._condition:
+            while not self._items and not self._stop_event.is_set():
+                self._condition.wait()
+            if not self._items:
+                self._worker_running = False
+                return []
+            batch, length = [], 0
+            while self._items and len(batch) < self.batch_size:
+                message = self._items[0][1]
+                if batch and length + len(message) + 2 > TELEGRAM_MAX_LENGTH:
+                    break
+                self._items.popleft()
+                batch.append(message)
+                length += len(message) + 2
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return  # Stopped and nothing left to send
+            self._send_with_retry("\n\n".join(batch), len(batch))
+
+    def _count(self, stat: str, amount: int = 1):
+        with self._condition:
+            self.stats[stat] += amount
+
+    def _send_with_retry(self, text: str, count: int):
+        for attempt in range(self.max_retries + 1):
+            started = time.perf_counter()
+            with self.send_context():
+                result = self.notifier.send(text)
+            if self.on_send is not None:
+                self.on_send(time.perf_counter() - started, result == SENT)
+            if result == SENT:
+                self._count("sent", count)
+                return
+            if result == FAILED:
+                break
+            if attempt < self.max_retries:
+                self._count("retries")
+                self._stop_event.wait(self.retry_delay * 2 ** attempt)
+        self._count("failed", count)
 # import requests
 # from requests.exceptions import RequestException
 # from typing import Optional
@@ -0,0 +1,119 @@
+import itertools
+import os
+import random
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence
+from .backtest import backtest, DEFAULT_FEE, DEFAULT_SLIPPAGE
+
+# The SettingsWindow spinbox ranges. BB_WINDOW is left out: the signal rules
+# don't use the Bollinger bands, so sweeping it only repeats identical runs.
+PARAMETER_RANGES = {
+    'rsi_window': list(range(5, 31)),
+    'sma_short': list(range(5, 21)),
+    'sma_long': list(range(20, 51)),
+    'volume_spike_ratio': [round(1.0 + 0.1 * i, 1) for i in range(21)],
+}
+
+# Worker process state: a view on the parent's shared candle block
+_worker_memory: Optional[shared_memory.SharedMemory] = None
+_worker_candles: Optional[np.ndarray] = None
+
+def _attach_candles(name: str, shape: tuple):
+    global _worker_memory, _worker_candles
+    _worker_memory = shared_memory.SharedMemory(name=name)
+    _worker_candles = np.ndarray(shape, dtype=np.float64, buffer=_worker_memory.buf)
+
+def _run_backtest(task) -> Dict[str, float]:
+    params, start, fee, slippage = task
+    close, volume = _worker_candles[0, start:], _worker_candles[1, start:]
+    result = backtest(close, volume, fee=fee, slippage=slippage, **{'bb_window': 20, **params})
+    return {**params, **result}
+
+class Optimizer:
+    """
+    Parameter sweep of the backtest across a process pool.
+
+    The candle history is copied once into shared memory and every worker
+    maps it, so tasks only carry a parameter dict. Search modes:
+    'grid' runs every combination, 'random' a sample of `samples` of them,
+    and 'halving' (successive halving) starts `samples` random combinations
+    on the most recent slice of history and keeps the best 1/eta of them on
+    an eta times longer slice each round, until the full history.
+    """
+
+    def __init__(self, close, volume, ranges: Optional[Dict[str, Sequence]] = None,
+                 workers: Optional[int] = None, metric: str = 'total_return',
+                 fee: float = DEFAULT_FEE, slippage: float = DEFAULT_SLIPPAGE):
+        self.candles = np.vstack([
+            np.asarray(close, dtype=np.float64),
+            np.asarray(volume, dtype=np.float64)
+        ])
+        self.ranges = ranges or PARAMETER_RANGES
+        self.workers = workers or os.cpu_count() or 1
+        self.metric = metric
+        self.fee = fee
+        self.slippage = slippage
+
+    def combinations(self) -> List[Dict]:
+        names = list(self.ranges)
+        return [dict(zip(names, values)) for values in itertools.product(*self.ranges.values())]
+
+    def run(self, mode: str = 'random', samples: int = 500, eta: int = 3, seed: int = 0) -> pd.DataFrame:
+        """
+        Returns:
+            pd.DataFrame: parameters and backtest metrics per combination, best first
+        """
+        combinations = self.combinations()
+        if mode != 'grid' and samples < len(combinations):
+            combinations = random.Random(seed).sample(combinations, samples)
+
+        memory = shared_memory.SharedMemory(create=True, size=self.candles.nbytes)
+        try:
+            shared = np.ndarray(self.candles.shape, dtype=np.float64, buffer=memory.buf)
+            shared[:] = self.candles
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_attach_candles,
+                initargs=(memory.name, self.candles.shape)
+            ) as pool:
+                if mode == 'halving':
+                    return self._successive_halving(pool, combinations, eta)
+                return self._evaluate(pool, combinations, start=0)
+        finally:
+            memory.close()
+            memory.unlink()
+
+    def _evaluate(self, pool, combinations: List[Dict], start: int) -> pd.DataFrame:
+        tasks = [(params, start, self.fee, self.slippage) for params in combinations]
+        chunksize = max(1, len(tasks) // (self.workers * 4))
+        results = pd.DataFrame(list(pool.map(_run_backtest, tasks, chunksize=chunksize)))
+        return results.sort_values(self.metric, ascending=False, ignore_index=True)
+
+    def _successive_halving(self, pool, combinations: List[Dict], eta: int) -> pd.DataFrame:
+        n = self.candles.shape[1]
+        rounds = 1
+        while len(combinations) // eta ** rounds >= 1 and n // eta ** rounds >= 100:
+            rounds += 1
+
+        for remaining in range(rounds - 1, -1, -1):
+            # Most recent n / eta**remaining candles
+            results = self._evaluate(pool, combinations, start=n - n // eta ** remaining)
+            if remaining == 0:
+                return results
+            keep = max(1, len(combinations) // eta)
+            combinations = results.head(keep)[list(self.ranges)].to_dict('records')
+
+PERCENT_COLUMNS = ['total_return', 'buy_hold_return', 'max_drawdown', 'win_rate',
+                   'avg_trade_return', 'best_trade', 'worst_trade', 'exposure']
+
+def format_results(results: pd.DataFrame, top: int = 20) -> str:
+    """The best `top` rows of Optimizer.run as a text table, fractions shown as percentages"""
+    table = results.head(top).copy()
+    for column in PERCENT_COLUMNS:
+        if column in table:
+            table[column] = table[column].map(lambda value: f"{value * 100:.2f}%")
+    table.index = range(1, len(table) + 1)
+    return table.to_string()
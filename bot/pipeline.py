@@ -0,0 +1,179 @@
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional
+from .analyzer import Analyzer
+from .candles import CandleBuffer
+
+# Analyzer kept per pool process, so streaming engines survive between calls
+_worker_analyzer: Optional[Analyzer] = None
+
+def analyze_candles(settings, symbol: str, ohlcv):
+    """Run Analyzer over a (candles, 6) OHLCV array, in a pool process or inline"""
+    global _worker_analyzer
+    if _worker_analyzer is None or _worker_analyzer.config != settings:
+        _worker_analyzer = Analyzer(settings)
+    return _worker_analyzer.analyze(CandleBuffer.from_rows(ohlcv).to_frame(symbol), settings.TIMEFRAME)
+
+def _warm_up(settings):
+    """Start-up task of a pool process: unpickling it imports this module (pandas, ta), then build the Analyzer"""
+    global _worker_analyzer
+    _worker_analyzer = Analyzer(settings)
+
+class Stage:
+    """
+    A bounded queue served by a pool of worker threads.
+
+    `handler(item)` returns the item for the next stage, or None to end there.
+    A worker waits for room in the next stage's queue instead of dropping, so
+    a slow stage only fills its own queue. Depth and service times are kept
+    for `stats`.
+    """
+
+    def __init__(self, name: str, handler: Callable, workers: int = 1, queue_size: int = 100):
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.next_stage: Optional["Stage"] = None
+        self.on_error: Optional[Callable] = None  # on_error(stage_name, item, exception)
+        self.processed = 0
+        self.errors = 0
+        self.rejected = 0
+        self.busy = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self):
+        self._stop_event.clear()
+        self._threads = [
+            threading.Thread(target=self._run, name=f"{self.name}-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def put(self, item) -> bool:
+        """Queue an item without waiting, False if the queue is full"""
+        try:
+            self.queue.put_nowait(item)
+            return True
+        except queue.Full:
+            with self._lock:
+                self.rejected += 1
+            return False
+
+    def _forward(self, item):
+        while not self._stop_event.is_set():
+            try:
+                self.next_stage.queue.put(item, timeout=0.2)
+                return
+            except queue.Full:
+                continue
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                item = self.queue.get(timeout=0.2)
+            except queue.Empty:
+                continue
+
+            with self._lock:
+                self.busy += 1
+            started = time.perf_counter()
+            try:
+                result = self.handler(item)
+            except Exception as e:
+                result = None
+                with self._lock:
+                    self.errors += 1
+                if self.on_error is not None:
+                    self.on_error(self.name, item, e)
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.busy -= 1
+                self.processed += 1
+                self.total_time += elapsed
+                self.max_time = max(self.max_time, elapsed)
+
+            if result is not None and self.next_stage is not None:
+                self._forward(result)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                'depth': self.queue.qsize(),
+                'workers': self.workers,
+                'busy': self.busy,
+                'processed': self.processed,
+                'errors': self.errors,
+                'rejected': self.rejected,
+                'avg_ms': self.total_time / self.processed * 1000 if self.processed else 0.0,
+                'max_ms': self.max_time * 1000,
+            }
+
+class AnalysisPool:
+    """
+    Runs analyze_candles on a process pool, so analysis doesn't hold the GIL
+    the fetch and notify threads need. With workers=0 it runs inline.
+    """
+
+    def __init__(self, workers: int, settings):
+        self.workers = workers
+        self._executor = None
+        if workers > 0:
+            # spawn: forking a process that already runs threads can deadlock the child
+            self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            # Start the processes and their Analyzers now, while the first candles are still being fetched
+            for _ in range(workers):
+                self._executor.submit(_warm_up, settings)
+
+    def analyze(self, settings, symbol: str, ohlcv):
+        if self._executor is None:
+            return analyze_candles(settings, symbol, ohlcv)
+        return self._executor.submit(analyze_candles, settings, symbol, ohlcv).result()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+class Pipeline:
+    """Stages chained in order: each stage's results are queued on the next one"""
+
+    def __init__(self, stages: List[Stage], on_error: Optional[Callable] = None):
+        self.stages = stages
+        for stage, next_stage in zip(stages, stages[1:]):
+            stage.next_stage = next_stage
+        for stage in stages:
+            stage.on_error = on_error
+
+    def start(self):
+        for stage in self.stages:
+            stage.start()
+
+    def stop(self):
+        for stage in self.stages:
+            stage.stop()
+
+    def submit(self, item) -> bool:
+        """Feed the first stage, False if it is still full from the last round"""
+        return self.stages[0].put(item)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {stage.name: stage.stats() for stage in self.stages}
+
+    def summary(self) -> str:
+        return "Pipeline " + " | ".join(
+            f"{name}: {s['depth']} queued, {s['busy']}/{s['workers']} busy, "
+            f"{s['avg_ms']:.1f} ms avg, {s['max_ms']:.1f} ms max, {s['errors']} errors"
+            for name, s in self.stats().items()
+        )
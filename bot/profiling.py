@@ -0,0 +1,224 @@
+import cProfile
+import io
+import os
+import pstats
+import signal
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+CYCLE = "cycle"  # run() code outside the named sections
+
+class CycleProfiler:
+    """
+    Profiles the next N cycles of BotManager.run when asked to, without a restart.
+
+    Code inside `section(name)` blocks gets its own cProfile stats per
+    section, whichever thread runs it, and the rest of the cycle is kept
+    under "cycle". tracemalloc runs for the whole capture: each section
+    records its peak memory growth and a snapshot comparison shows where
+    memory grew. When the last cycle ends the stats (.prof, readable with
+    pstats or snakeviz), the end snapshot and a text report are written
+    to a timestamped folder in report_dir.
+
+    Sections running in several threads at once share tracemalloc's peak,
+    so their memory figures are upper bounds.
+    """
+
+    def __init__(self, report_dir: str = "profiles", top: int = 10, cycles: int = 5,
+                 trigger_file: Optional[str] = "profile.request"):
+        self.report_dir = report_dir
+        self.top = top
+        self.cycles = cycles
+        self.trigger_file = trigger_file
+        self.last_report: Optional[str] = None
+        self._pending = 0  # Set from signal handlers, so no lock
+        self._remaining = 0
+        self._captured = 0
+        self._profiles: Dict[Tuple[str, int], cProfile.Profile] = {}
+        self._running = set()  # (section, thread) whose profile is enabled
+        self._sections: Dict[str, List[float]] = {}  # section -> [calls, seconds, peak bytes]
+        self._skipped = 0
+        self._snapshot = None
+        self._started_tracing = False
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        return self._remaining > 0
+
+    def request(self, cycles: Optional[int] = None) -> int:
+        """Profile the next `cycles` cycles (the configured count by default), returns the count"""
+        self._pending = max(1, int(cycles or self.cycles))
+        return self._pending
+
+    def _check_trigger_file(self):
+        """A trigger file requests a capture and is removed, its content may give the cycle count"""
+        if not self.trigger_file or not os.path.exists(self.trigger_file):
+            return
+        try:
+            with open(self.trigger_file) as f:
+                content = f.read().strip()
+            os.remove(self.trigger_file)
+        except OSError:
+            return
+        self.request(int(content) if content.isdigit() else None)
+
+    def begin_cycle(self):
+        self._check_trigger_file()
+        if not self._remaining:
+            if not self._pending:
+                return
+            self._start(self._pending)
+        self._enable((CYCLE, threading.get_ident()))
+
+    def _start(self, cycles: int):
+        self._pending = 0
+        self._captured = 0
+        with self._lock:  # A section still running in another thread keeps its profile until it ends
+            self._profiles = {key: profile for key, profile in self._profiles.items() if key in self._running}
+        self._sections.clear()
+        self._skipped = 0
+        self._started_tracing = not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+        self._snapshot = tracemalloc.take_snapshot()
+        self._remaining = cycles
+
+    def _enable(self, key) -> bool:
+        """Enable the profile of (section, thread), False if another profiler holds the hook"""
+        with self._lock:
+            if key in self._running:
+                return True
+            profile = self._profiles.get(key)
+            if profile is None:
+                profile = self._profiles[key] = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:  # Python 3.12+ allows only one active profiler
+                self._skipped += 1
+                return False
+            self._running.add(key)
+            return True
+
+    def _disable(self, key) -> bool:
+        with self._lock:
+            if key not in self._running:
+                return False
+            self._profiles[key].disable()
+            self._running.discard(key)
+            return True
+
+    @contextmanager
+    def section(self, name: str):
+        """Profile the block under `name` while a capture is running"""
+        if not self._remaining:
+            yield
+            return
+
+        thread = threading.get_ident()
+        cycle_paused = self._disable((CYCLE, thread))
+        profiled = self._enable((name, thread))
+        memory_before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            if profiled:
+                self._disable((name, thread))
+            peak = tracemalloc.get_traced_memory()[1] - memory_before if tracemalloc.is_tracing() else 0
+            with self._lock:
+                totals = self._sections.setdefault(name, [0, 0.0, 0])
+                totals[0] += 1
+                totals[1] += elapsed
+                totals[2] = max(totals[2], peak)
+            if cycle_paused and self._remaining:
+                self._enable((CYCLE, thread))
+
+    def end_cycle(self) -> Optional[str]:
+        """Close the cycle, returns the log summary once the last requested cycle is done"""
+        if not self._remaining:
+            return None
+        self._disable((CYCLE, threading.get_ident()))
+        self._captured += 1
+        self._remaining -= 1
+        if self._remaining:
+            return None
+        return self._finish()
+
+    def _section_stats(self) -> Dict[str, pstats.Stats]:
+        """Stats merged across threads, sections still running in other threads are left out"""
+        merged: Dict[str, pstats.Stats] = {}
+        with self._lock:
+            for (name, thread), profile in self._profiles.items():
+                if (name, thread) in self._running:
+                    continue
+                profile.create_stats()
+                if not profile.stats:
+                    continue
+                if name in merged:
+                    merged[name].add(profile)
+                else:
+                    merged[name] = pstats.Stats(profile)
+        return merged
+
+    def _finish(self) -> str:
+        snapshot = tracemalloc.take_snapshot()
+        if self._started_tracing:
+            tracemalloc.stop()
+        growth = snapshot.compare_to(self._snapshot, "lineno")[:self.top]
+
+        folder = os.path.join(self.report_dir, time.strftime("%Y%m%d-%H%M%S"))
+        os.makedirs(folder, exist_ok=True)
+        section_stats = self._section_stats()
+        for name, stats in section_stats.items():
+            stats.dump_stats(os.path.join(folder, f"{name}.prof"))
+        snapshot.dump(os.path.join(folder, "memory.snapshot"))
+
+        report = io.StringIO()
+        report.write(f"Profile of {self._captured} cycles\n")
+        for name, stats in section_stats.items():
+            report.write(f"\n=== {name}: {self._describe(name)} ===\n")
+            stats.stream = report
+            stats.sort_stats("cumulative").print_stats(self.top)
+        report.write("\n=== Memory growth over the capture ===\n")
+        report.writelines(f"{stat}\n" for stat in growth)
+        with open(os.path.join(folder, "report.txt"), "w") as f:
+            f.write(report.getvalue())
+
+        self.last_report = folder
+        return self._summary(folder, section_stats, growth)
+
+    def _describe(self, name: str) -> str:
+        if name not in self._sections:
+            return "rest of run()"
+        calls, seconds, peak = self._sections[name]
+        return f"{calls} calls, {seconds * 1000:.1f} ms, peak +{peak / 1024:.1f} KiB"
+
+    def _summary(self, folder: str, section_stats: Dict[str, pstats.Stats], growth) -> str:
+        lines = [f"Profile of {self._captured} cycles written to {folder}"]
+        for name, stats in section_stats.items():
+            lines.append(f"{name}: {self._describe(name)}")
+            by_own_time = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:self.top]
+            for (filename, line, function), (_, ncalls, tottime, cumtime, _) in by_own_time:
+                lines.append(f"  {tottime * 1000:8.1f} ms own {cumtime * 1000:8.1f} ms cum {ncalls:6d}x "
+                             f"{function} ({os.path.basename(filename)}:{line})")
+        if growth:
+            lines.append("Memory growth: " + " | ".join(
+                f"{os.path.basename(stat.traceback[0].filename)}:{stat.traceback[0].lineno} {stat.size_diff / 1024:+.1f} KiB"
+                for stat in growth[:3]
+            ))
+        if self._skipped:
+            lines.append(f"{self._skipped} sections not profiled, another profiler was active")
+        return "\n".join(lines)
+
+def install_signal_trigger(profiler: CycleProfiler) -> bool:
+    """SIGUSR1 requests a capture. Unix only, and signal handlers can only be set from the main thread"""
+    if not hasattr(signal, "SIGUSR1") or threading.current_thread() is not threading.main_thread():
+        return False
+    signal.signal(signal.SIGUSR1, lambda *_: profiler.request())
+    return True
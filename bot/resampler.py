@@ -0,0 +1,105 @@
+import ccxt
+import pandas as pd
+from collections import deque
+from typing import Dict, Iterable, List
+from .exchange import ohlcv_frame
+
+DAY_MS = 24 * 60 * 60 * 1000
+WEEK_OFFSET_MS = 4 * DAY_MS  # 1970-01-01 was a Thursday, exchange weeks open on Monday 00:00 UTC
+
+def timeframe_ms(timeframe: str) -> int:
+    if timeframe.endswith("M"):
+        raise ValueError("Monthly candles have no fixed length and can't be resampled")
+    return ccxt.Exchange.parse_timeframe(timeframe) * 1000
+
+def bucket_start(timestamp: int, timeframe: str) -> int:
+    """Open time of the `timeframe` candle containing `timestamp`, as the exchange aligns it"""
+    length = timeframe_ms(timeframe)
+    offset = WEEK_OFFSET_MS if timeframe.endswith("w") else 0
+    return timestamp - (timestamp - offset) % length
+
+class Resampler:
+    """
+    Builds higher timeframe candles locally from one base timeframe stream.
+
+    Each higher timeframe is seeded once with `bootstrap` (its history from
+    the exchange) and then kept current by `update` with the base candles, so
+    watching several timeframes costs a single fetch per cycle. The newest
+    bucket is re-aggregated from its base candles on every update, so a
+    revised forming base candle is picked up.
+    """
+
+    def __init__(self, base_timeframe: str, timeframes: Iterable[str], limit: int = 100):
+        self.base_timeframe = base_timeframe
+        self.limit = limit
+        base_ms = timeframe_ms(base_timeframe)
+        self.timeframes = []
+        for timeframe in timeframes:
+            if timeframe_ms(timeframe) <= base_ms or timeframe_ms(timeframe) % base_ms:
+                raise ValueError(f"{timeframe} is not a multiple of the base timeframe {base_timeframe}")
+            self.timeframes.append(timeframe)
+
+        self._candles: Dict[str, deque] = {timeframe: deque(maxlen=limit) for timeframe in self.timeframes}
+        self._members: Dict[str, dict] = {timeframe: {} for timeframe in self.timeframes}  # base candles of the newest bucket
+        self._last_base = None
+
+    @property
+    def base_candles_needed(self) -> int:
+        """Base candles an update needs to see the whole of the longest bucket"""
+        base_ms = timeframe_ms(self.base_timeframe)
+        return max((timeframe_ms(timeframe) // base_ms for timeframe in self.timeframes), default=0) + 1
+
+    def bootstrap(self, timeframe: str, ohlcv: List[list]):
+        """Seed a timeframe with candles fetched from the exchange (oldest first)"""
+        candles = self._candles[timeframe]
+        candles.clear()
+        candles.extend(list(candle) for candle in ohlcv)
+        self._members[timeframe] = {}
+        self._last_base = None  # The next update re-reads the base candles of the forming bucket
+
+    def update(self, base_ohlcv: Iterable[list]):
+        """
+        Fold base candles (oldest first) into every timeframe. Candles older
+        than the last one already seen are skipped, that one is re-applied
+        since it may have been forming.
+        """
+        for candle in base_ohlcv:
+            timestamp = int(candle[0])
+            if self._last_base is not None and timestamp < self._last_base:
+                continue
+            self._last_base = timestamp
+            for timeframe in self.timeframes:
+                self._add(timeframe, timestamp, candle)
+
+    def _add(self, timeframe: str, timestamp: int, candle):
+        candles = self._candles[timeframe]
+        members = self._members[timeframe]
+        start = bucket_start(timestamp, timeframe)
+
+        if candles and start < candles[-1][0]:
+            return  # Belongs to a bucket that is already closed
+        current = bool(candles) and start == candles[-1][0]
+        if not current:
+            members.clear()
+        members[timestamp] = candle
+
+        rows = [members[key] for key in sorted(members)]
+        bucket = [
+            start,
+            float(rows[0][1]),
+            float(max(row[2] for row in rows)),
+            float(min(row[3] for row in rows)),
+            float(rows[-1][4]),
+            float(sum(row[5] for row in rows)),
+        ]
+        if current:
+            candles[-1] = bucket
+        else:
+            candles.append(bucket)
+
+    def get_ohlcv(self, timeframe: str) -> List[list]:
+        return list(self._candles[timeframe])
+
+    def frames(self, symbol: str) -> Dict[str, pd.DataFrame]:
+        """OHLCV DataFrames of every timeframe, as Exchange.get_ohlcv returns them"""
+        return {timeframe: ohlcv_frame(list(candles), symbol) for timeframe, candles in self._candles.items()}
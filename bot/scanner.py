@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+from .async_exchange import AsyncExchange
+
+class MarketScanner:
+    """
+    Analyzes the whole active /USDT universe in one cycle.
+
+    A single bulk fetch_tickers call pre-filters pairs on 24h quote volume and
+    price change, OHLCV for the survivors is fetched concurrently, and all of
+    them are analyzed in one Analyzer.analyze_batch pass.
+    """
+
+    def __init__(self, config, exchange, analyzer):
+        self.config = config
+        self.exchange = exchange
+        self.analyzer = analyzer
+        self.async_exchange = AsyncExchange(exchange.exchange_name, max_concurrency=config.SCAN_CONCURRENCY)
+
+    def prefilter(self) -> pd.DataFrame:
+        """Pairs passing the ticker filters, most traded first, capped at SCAN_MAX_PAIRS"""
+        tickers = self.exchange.get_tickers(self.exchange.get_available_pairs())
+        rows = [
+            (symbol, ticker.get('quoteVolume') or 0.0, ticker.get('percentage') or 0.0)
+            for symbol, ticker in tickers.items()
+            if self.exchange.is_pair_supported(symbol)
+        ]
+        universe = pd.DataFrame(rows, columns=['symbol', 'quote_volume', 'change_pct']).set_index('symbol')
+        universe = universe[
+            (universe['quote_volume'] >= self.config.SCAN_MIN_QUOTE_VOLUME) &
+            (universe['change_pct'].abs() >= self.config.SCAN_MIN_CHANGE_PCT)
+        ]
+        return universe.sort_values('quote_volume', ascending=False).head(self.config.SCAN_MAX_PAIRS)
+
+    def scan(self, limit: int = 100) -> pd.DataFrame:
+        """
+        Returns:
+            pd.DataFrame: One row per analyzed pair, BUY/SELL candidates first,
+            ranked by how far RSI is into its band, then by quote volume
+        """
+        universe = self.prefilter()
+        candles = self.async_exchange.gather_ohlcv(
+            list(universe.index), self.config.TIMEFRAME, limit=limit, as_arrays=True
+        )
+
+        # Batch analysis needs aligned rows: full history ending on the same candle
+        latest = max((ohlcv[-1, 0] for ohlcv in candles.values() if len(ohlcv)), default=None)
+        symbols = [
+            symbol for symbol, ohlcv in candles.items()
+            if len(ohlcv) == limit and ohlcv[-1, 0] == latest
+        ]
+        if not symbols:
+            return pd.DataFrame(columns=['signal', 'quote_volume', 'change_pct'])
+
+        matrix = np.stack([candles[symbol] for symbol in symbols])
+        table = self.analyzer.analyze_batch(symbols, matrix[:, :, 4], matrix[:, :, 5])
+        table = table.join(universe)
+
+        table['score'] = np.select(
+            [table['signal'] == "BUY", table['signal'] == "SELL"],
+            [30 - table['rsi'], table['rsi'] - 70],
+            default=-np.inf
+        )
+        return table.sort_values(['score', 'quote_volume'], ascending=False)
+
+    @staticmethod
+    def format_table(table: pd.DataFrame, top: int = 10) -> str:
+        candidates = table[table['signal'] != "HOLD"].head(top)
+        lines = [f"Market scan: {len(table)} pairs, {len(table[table['signal'] != 'HOLD'])} BUY/SELL candidates"]
+        for symbol, row in candidates.iterrows():
+            lines.append(
+                f"{row['signal']:<4} {symbol:<14} Price: {row['close']:.4f} | RSI: {row['rsi']:.2f} | "
+                f"24h: {row['change_pct']:+.2f}% | Vol: {row['quote_volume']:.0f}"
+            )
+        return "\n".join(lines)
+
+    def close(self):
+        self.async_exchange.close()
@@ -0,0 +1,56 @@
+import time
+import ccxt
+from typing import Tuple
+
+CLOCK_SYNC_INTERVAL = 60 * 60  # seconds between server clock offset refreshes
+
+class CandleScheduler:
+    """
+    Works out when to run the next bot cycle from the candle timeframe.
+
+    Cycles fire `close_delay_ms` after each candle closes on the exchange's
+    clock, with optional cheaper refreshes every `refresh_interval` seconds
+    while a candle is forming.
+    """
+
+    def __init__(self, timeframe: str, close_delay_ms: int = 300, refresh_interval: int = 0):
+        self.timeframe = timeframe
+        self.timeframe_ms = ccxt.Exchange.parse_timeframe(timeframe) * 1000
+        self.close_delay_ms = close_delay_ms
+        self.refresh_interval = refresh_interval
+        self.clock_offset_ms = 0  # exchange clock minus local clock
+        self._clock_synced_at = None
+
+    @property
+    def period(self) -> float:
+        """Seconds between runs: the refresh interval while candles form, else one candle"""
+        timeframe = self.timeframe_ms / 1000
+        return self.refresh_interval if 0 < self.refresh_interval < timeframe else timeframe
+
+    def sync_clock(self, offset_ms: int):
+        self.clock_offset_ms = offset_ms
+        self._clock_synced_at = time.monotonic()
+
+    def clock_stale(self) -> bool:
+        return self._clock_synced_at is None or \
+            time.monotonic() - self._clock_synced_at > CLOCK_SYNC_INTERVAL
+
+    def next_close(self, server_ms: int) -> int:
+        """Exchange timestamp at which the currently forming candle closes"""
+        return (server_ms // self.timeframe_ms + 1) * self.timeframe_ms
+
+    def next_run(self, now_ms: int = None) -> Tuple[float, bool]:
+        """
+        Returns:
+            (seconds to wait, whether that run follows a candle close)
+        """
+        if now_ms is None:
+            now_ms = int(time.time() * 1000)
+        server_ms = now_ms + self.clock_offset_ms
+        # Still inside the delay window of a close that just happened
+        fire_at = self.next_close(server_ms - self.close_delay_ms) + self.close_delay_ms
+        wait_ms = fire_at - server_ms
+
+        if self.refresh_interval > 0 and self.refresh_interval * 1000 < wait_ms:
+            return self.refresh_interval, False
+        return wait_ms / 1000, True
@@ -0,0 +1,75 @@
+import math
+import time
+from typing import Dict, Optional, Tuple
+
+class SignalTracker:
+    """
+    Decides which analysis results are worth a notification.
+
+    A result is reported when it is the first for its (exchange, symbol,
+    timeframe) key, when the signal changes, when RSI crosses into another
+    band, or when the price moved more than `price_change_pct` since the last
+    report. Everything else is only summarised in a periodic heartbeat digest.
+    """
+
+    def __init__(self, price_change_pct: float = 1.0, heartbeat_interval: int = 3600,
+                 rsi_bands: Tuple[float, float] = (30, 70)):
+        self.price_change_pct = price_change_pct
+        self.heartbeat_interval = heartbeat_interval
+        self.rsi_bands = rsi_bands
+        self._reported: Dict[tuple, dict] = {}
+        self._latest: Dict[tuple, dict] = {}
+        self._last_heartbeat = time.monotonic()
+
+    def _rsi_zone(self, rsi) -> str:
+        if rsi is None or math.isnan(rsi):
+            return "unknown"
+        if rsi < self.rsi_bands[0]:
+            return "oversold"
+        if rsi > self.rsi_bands[1]:
+            return "overbought"
+        return "neutral"
+
+    def check(self, key: tuple, signal: str, data: dict) -> Optional[str]:
+        """Return why this result should be sent, or None if it adds nothing new"""
+        state = {
+            "signal": signal,
+            "rsi_zone": self._rsi_zone(data.get('rsi')),
+            "price": float(data.get('close', 0)),
+            "rsi": data.get('rsi'),
+        }
+        self._latest[key] = state
+        previous = self._reported.get(key)
+
+        if previous is None:
+            reason = "first signal"
+        elif signal != previous["signal"]:
+            reason = f"signal {previous['signal']} -> {signal}"
+        elif state["rsi_zone"] != previous["rsi_zone"]:
+            reason = f"RSI {previous['rsi_zone']} -> {state['rsi_zone']}"
+        elif previous["price"] and \
+                abs(state["price"] / previous["price"] - 1) * 100 >= self.price_change_pct:
+            reason = f"price moved {(state['price'] / previous['price'] - 1) * 100:+.2f}%"
+        else:
+            return None
+
+        self._reported[key] = state
+        return reason
+
+    def heartbeat(self) -> Optional[str]:
+        """Digest of the latest result for every key, at most once per heartbeat_interval"""
+        if self.heartbeat_interval <= 0 or not self._latest:
+            return None
+        if time.monotonic() - self._last_heartbeat < self.heartbeat_interval:
+            return None
+        self._last_heartbeat = time.monotonic()
+
+        lines = [f"Heartbeat: {len(self._latest)} pair(s)"]
+        for (exchange, symbol, timeframe), state in sorted(self._latest.items()):
+            rsi = state["rsi"]
+            rsi_text = "N/A" if rsi is None or math.isnan(rsi) else f"{rsi:.2f}"
+            lines.append(
+                f"{symbol} {timeframe} ({exchange.upper()}): {state['signal']} "
+                f"@ {state['price']:.4f} | RSI {rsi_text}"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,193 @@
+import math
+from collections import deque
+from typing import Dict, Optional
+
+
+class _RollingWindow:
+    """Fixed-size window with running sums, updated in constant time"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values = deque(maxlen=size)
+        self._shift = 0.0
+        self._total = 0.0
+        self._total_sq = 0.0
+        self._pushes = 0
+
+    def push(self, value: float):
+        if len(self.values) == self.size:
+            self._remove(self.values[0])
+        self.values.append(value)
+        self._add(value)
+        self._pushes += 1
+        if self._pushes % self.size == 0:
+            self._resum()  # Keep floating point drift of the running sums bounded
+
+    def revise_last(self, value: float):
+        self._remove(self.values[-1])
+        self.values[-1] = value
+        self._add(value)
+
+    def _add(self, value: float):
+        shifted = value - self._shift
+        self._total += shifted
+        self._total_sq += shifted * shifted
+
+    def _remove(self, value: float):
+        shifted = value - self._shift
+        self._total -= shifted
+        self._total_sq -= shifted * shifted
+
+    def _resum(self):
+        # Sums are kept relative to the window mean so the variance doesn't cancel out on large prices
+        self._shift = sum(self.values) / len(self.values)
+        self._total = 0.0
+        self._total_sq = 0.0
+        for value in self.values:
+            self._add(value)
+
+    @property
+    def full(self) -> bool:
+        return len(self.values) == self.size
+
+    def mean(self) -> float:
+        if not self.full:
+            return math.nan
+        return self._shift + self._total / self.size
+
+    def std(self) -> float:
+        """Population standard deviation (ddof=0), as used by Bollinger Bands"""
+        if not self.full:
+            return math.nan
+        offset = self._total / self.size
+        return math.sqrt(max(self._total_sq / self.size - offset * offset, 0.0))
+
+
+class _Ema:
+    """Exponential average matching pandas ewm(adjust=False), seeded with the first value"""
+
+    def __init__(self, alpha: float, min_periods: int):
+        self.alpha = alpha
+        self.min_periods = min_periods
+        self.count = 0
+        self._value = math.nan
+        self._previous = math.nan
+
+    def push(self, value: float):
+        self._previous = self._value
+        self.count += 1
+        self._value = self._step(self._previous, value)
+
+    def revise_last(self, value: float):
+        self._value = self._step(self._previous, value)
+
+    def _step(self, previous: float, value: float) -> float:
+        if self.count == 1:
+            return value
+        return previous + self.alpha * (value - previous)
+
+    @property
+    def value(self) -> float:
+        return self._value if self.count >= self.min_periods else math.nan
+
+
+class StreamingIndicators:
+    """
+    Incremental version of the indicators computed by Analyzer.
+
+    Each new candle is pushed once and the forming candle can be revised any
+    number of times, both in constant time. Fed the same series, the values
+    match the `ta` library implementation used by Analyzer.
+    """
+
+    def __init__(self, rsi_window: int, sma_short: int, sma_long: int, bb_window: int,
+                 bb_dev: float = 2, volume_window: int = 10,
+                 macd_fast: int = 12, macd_slow: int = 26, macd_sign: int = 9):
+        self.bb_dev = bb_dev
+        self.last_timestamp: Optional[int] = None
+
+        self._gain = _Ema(1 / rsi_window, rsi_window)
+        self._loss = _Ema(1 / rsi_window, rsi_window)
+        self._ma_short = _RollingWindow(sma_short)
+        self._ma_long = _RollingWindow(sma_long)
+        self._bb = _RollingWindow(bb_window)
+        self._volume = _RollingWindow(volume_window)
+        self._ema_fast = _Ema(2 / (macd_fast + 1), macd_fast)
+        self._ema_slow = _Ema(2 / (macd_slow + 1), macd_slow)
+        self._macd_signal = _Ema(2 / (macd_sign + 1), macd_sign)
+
+        self._previous_close = math.nan
+        self._close = math.nan
+        self._volume_value = math.nan
+
+    def update(self, timestamp: int, close: float, volume: float):
+        """Add a new candle, or revise the newest one if the timestamp is unchanged"""
+        if self.last_timestamp is not None and timestamp == self.last_timestamp:
+            self._revise(close, volume)
+        elif self.last_timestamp is None or timestamp > self.last_timestamp:
+            self._push(close, volume)
+            self.last_timestamp = timestamp
+        else:
+            raise ValueError(f"Candle {timestamp} is older than the last one seen ({self.last_timestamp})")
+
+    def _push(self, close: float, volume: float):
+        self._previous_close = self._close
+        self._close = close
+        self._volume_value = volume
+
+        gain, loss = self._changes(close)
+        self._gain.push(gain)
+        self._loss.push(loss)
+        for window in (self._ma_short, self._ma_long, self._bb):
+            window.push(close)
+        self._volume.push(volume)
+
+        self._ema_fast.push(close)
+        self._ema_slow.push(close)
+        macd = self._ema_fast.value - self._ema_slow.value
+        if not math.isnan(macd):
+            self._macd_signal.push(macd)
+
+    def _revise(self, close: float, volume: float):
+        self._close = close
+        self._volume_value = volume
+
+        gain, loss = self._changes(close)
+        self._gain.revise_last(gain)
+        self._loss.revise_last(loss)
+        for window in (self._ma_short, self._ma_long, self._bb):
+            window.revise_last(close)
+        self._volume.revise_last(volume)
+
+        self._ema_fast.revise_last(close)
+        self._ema_slow.revise_last(close)
+        macd = self._ema_fast.value - self._ema_slow.value
+        if not math.isnan(macd):
+            self._macd_signal.revise_last(macd)
+
+    def _changes(self, close: float):
+        # The first candle has no previous close and counts as no change, like `ta`
+        change = 0.0 if math.isnan(self._previous_close) else close - self._previous_close
+        return max(change, 0.0), max(-change, 0.0)
+
+    def _rsi(self) -> float:
+        gain, loss = self._gain.value, self._loss.value
+        if math.isnan(loss):
+            return math.nan
+        if loss == 0:
+            return 100.0
+        return 100 - 100 / (1 + gain / loss)
+
+    def values(self) -> Dict[str, float]:
+        """Indicator values for the newest candle, using the same keys as Analyzer"""
+        bb_mid, bb_std = self._bb.mean(), self._bb.std()
+        return {
+            'rsi': self._rsi(),
+            'ma_short': self._ma_short.mean(),
+            'ma_long': self._ma_long.mean(),
+            'macd': self._ema_fast.value - self._ema_slow.value,
+            'macd_signal': self._macd_signal.value,
+            'bb_upper': bb_mid + self.bb_dev * bb_std,
+            'bb_lower': bb_mid - self.bb_dev * bb_std,
+            'avg_volume': self._volume.mean(),
+        }
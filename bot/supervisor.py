@@ -0,0 +1,195 @@
+import multiprocessing
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+from .analyzer import Analyzer
+from .exchange import Exchange
+
+def _shard_worker(worker_id: int, symbols: List[str], commands, results):
+    """
+    Worker process: owns an Exchange and Analyzer and, for every cycle
+    command, fetches and analyzes its shard and reports each pair.
+    """
+    exchange: Optional[Exchange] = None
+    analyzer: Optional[Analyzer] = None
+    while True:
+        command = commands.get()
+        if command[0] == "stop":
+            return
+        if command[0] == "assign":
+            symbols = command[1]
+            continue
+
+        _, settings, closing = command
+        started = time.perf_counter()
+        try:
+            if exchange is None or exchange.exchange_name != settings.EXCHANGE:
+                exchange = Exchange(settings.EXCHANGE)
+            if analyzer is None or analyzer.config != settings:
+                analyzer = Analyzer(settings)
+        except Exception as e:
+            results.put(("error", worker_id, None, f"worker setup failed: {e}"))
+            results.put(("done", worker_id, 0, time.perf_counter() - started))
+            continue
+
+        for symbol in symbols:
+            try:
+                df = exchange.get_ohlcv(symbol, settings.TIMEFRAME)
+                signal, latest = analyzer.analyze(df)
+                results.put(("result", worker_id, symbol, signal, latest, settings, closing))
+            except Exception as e:
+                results.put(("error", worker_id, symbol, str(e)))
+        results.put(("done", worker_id, len(symbols), time.perf_counter() - started))
+
+class ShardSupervisor:
+    """
+    Splits a watchlist across worker processes, each with its own Exchange
+    and Analyzer, so analysis of many pairs uses every core.
+
+    Results come back on one queue and are handed to `on_result` from a
+    collector thread. Before each cycle dead workers are replaced and the
+    pairs are spread over the live workers again.
+    """
+
+    def __init__(self, workers: int, on_result: Callable, on_error: Callable,
+                 on_idle: Optional[Callable] = None):
+        self.workers = max(1, workers)
+        self.on_result = on_result  # on_result((symbol, settings, closing, signal, latest_data))
+        self.on_error = on_error    # on_error(message)
+        self.on_idle = on_idle      # on_idle() once no worker is busy anymore
+        self.symbols: List[str] = []
+        self.restarts = 0
+        self.skipped = 0
+        self._context = multiprocessing.get_context("spawn")
+        self._results = self._context.Queue()
+        self._processes: Dict[int, multiprocessing.Process] = {}
+        self._commands: Dict[int, multiprocessing.Queue] = {}
+        self._shards: Dict[int, List[str]] = {}
+        self._busy = set()  # workers that haven't finished their last cycle
+        self._last_cycle: Dict[int, tuple] = {}  # worker -> (pairs, seconds)
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._collector: Optional[threading.Thread] = None
+
+    def start(self, symbols: List[str]):
+        self.symbols = list(symbols)
+        for worker_id in range(self.workers):
+            self._spawn(worker_id)
+        self._rebalance()
+        self._stop_event.clear()
+        self._collector = threading.Thread(target=self._collect, daemon=True)
+        self._collector.start()
+
+    def _spawn(self, worker_id: int):
+        commands = self._context.Queue()
+        process = self._context.Process(
+            target=_shard_worker,
+            args=(worker_id, [], commands, self._results),
+            name=f"shard-{worker_id}",
+            daemon=True
+        )
+        process.start()
+        self._processes[worker_id] = process
+        self._commands[worker_id] = commands
+
+    def _rebalance(self):
+        """Deal the pairs round-robin over the workers and send each its shard"""
+        with self._lock:
+            worker_ids = sorted(self._processes)
+            self._shards = {worker_id: self.symbols[i::len(worker_ids)] for i, worker_id in enumerate(worker_ids)}
+        for worker_id, shard in self._shards.items():
+            self._commands[worker_id].put(("assign", shard))
+
+    def assign(self, symbols: List[str]):
+        """Change the watchlist, re-sharding only if it differs"""
+        if list(symbols) != self.symbols:
+            self.symbols = list(symbols)
+            self._rebalance()
+
+    def check_workers(self) -> List[int]:
+        """Replace dead workers and re-shard, returns the ids that were restarted"""
+        dead = [worker_id for worker_id, process in self._processes.items() if not process.is_alive()]
+        for worker_id in dead:
+            exitcode = self._processes[worker_id].exitcode
+            lost = self._shards.get(worker_id, [])
+            self.on_error(f"Shard worker {worker_id} died (exit code {exitcode}), "
+                          f"restarting it and rebalancing {len(lost)} pairs")
+            with self._lock:
+                self._busy.discard(worker_id)
+            self._spawn(worker_id)
+            self.restarts += 1
+        if dead:
+            self._rebalance()
+        return dead
+
+    def cycle(self, settings, closing: bool = True):
+        """Ask every idle worker to process its shard, skipping those still busy"""
+        self.check_workers()
+        for worker_id, commands in self._commands.items():
+            with self._lock:
+                if worker_id in self._busy:
+                    self.skipped += 1
+                    self.on_error(f"Shard worker {worker_id} still busy, skipping its pairs this cycle")
+                    continue
+                self._busy.add(worker_id)
+            commands.put(("cycle", settings, closing))
+
+    def _collect(self):
+        while not self._stop_event.is_set():
+            try:
+                message = self._results.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                return
+
+            kind, worker_id = message[0], message[1]
+            try:
+                if kind == "result":
+                    _, _, symbol, signal, latest_data, settings, closing = message
+                    self.on_result((symbol, settings, closing, signal, latest_data))
+                elif kind == "error":
+                    self.on_error(f"Shard worker {worker_id} {message[2] or ''}: {message[3]}")
+                elif kind == "done":
+                    with self._lock:
+                        self._busy.discard(worker_id)
+                        self._last_cycle[worker_id] = (message[2], message[3])
+                        idle = not self._busy
+                    if idle and self.on_idle is not None:
+                        self.on_idle()
+            except Exception as e:
+                self.on_error(f"Shard result handling failed: {e}")
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                'workers': len(self._processes),
+                'alive': sum(process.is_alive() for process in self._processes.values()),
+                'pairs': len(self.symbols),
+                'busy': len(self._busy),
+                'restarts': self.restarts,
+                'skipped': self.skipped,
+                'last_cycle': dict(self._last_cycle),
+            }
+
+    def summary(self) -> str:
+        stats = self.stats()
+        workers = " | ".join(
+            f"#{worker_id}: {pairs} pairs in {seconds:.2f} s"
+            for worker_id, (pairs, seconds) in sorted(stats['last_cycle'].items())
+        )
+        return (f"Shards: {stats['alive']}/{stats['workers']} workers alive, {stats['pairs']} pairs, "
+                f"{stats['restarts']} restarts" + (f" | {workers}" if workers else ""))
+
+    def stop(self, timeout: float = 5.0):
+        for commands in self._commands.values():
+            commands.put(("stop",))
+        deadline = time.monotonic() + timeout
+        for process in self._processes.values():
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.terminate()
+        self._stop_event.set()
+        self._processes.clear()
+        self._commands.clear()
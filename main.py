@@ -1,23 +1,75 @@
-from bot.config import Config
+import time
+STARTED_AT = time.perf_counter()
+
+import argparse
+import json
+import threading
+from bot.config import Config, PROJECT_DIR
 from bot.exchange import Exchange
 from bot.analyzer import Analyzer
-from bot.notifier import Notifier
-from ui.main_window import MainWindow
-import threading
-import time
+from bot.cache import AnalysisCache
+from bot.notifier import Notifier, NotificationQueue
+from bot.scheduler import CandleScheduler
+from bot.signal_tracker import SignalTracker
+from bot.events import EventChannel
+from bot.scanner import MarketScanner
+from bot.resampler import Resampler
+from bot.pipeline import Pipeline, Stage, AnalysisPool
+from bot.supervisor import ShardSupervisor
+from bot.metrics import BotMetrics, MetricsServer
+from bot.profiling import CycleProfiler, install_signal_trigger
+from bot.daemon import run_headless, startup_report
+from bot.optimizer import Optimizer, format_results
+from bot.candles import parse_ohlcv
 from typing import Optional
 
 class BotManager:
     def __init__(self):
         self.config = Config()
+        self.events = EventChannel()
         self.exchange = Exchange(self.config.EXCHANGE)
         self.config.available_pairs = self.exchange.get_available_pairs()
-        self.analyzer = Analyzer(self.config)
+        self.analysis_cache = self._create_analysis_cache()
+        self.analyzer = Analyzer(self.config, cache=self.analysis_cache)
         self.notifier = Notifier(self.config)
+        self.notification_queue = NotificationQueue(
+            self.notifier,
+            max_size=self.config.NOTIFY_QUEUE_SIZE,
+            batch_size=self.config.NOTIFY_BATCH_SIZE,
+            max_retries=self.config.NOTIFY_MAX_RETRIES
+        )
+        self.notification_queue.start()
+        self.signal_tracker = self._create_signal_tracker()
         self.running = False
         # self.thread = None
         self.thread: Optional[threading.Thread] = None
         self.stop_event = threading.Event()
+        self.scheduler: Optional[CandleScheduler] = None
+        self.scanner: Optional[MarketScanner] = None
+        self.resampler: Optional[Resampler] = None
+        self.pipeline: Optional[Pipeline] = None
+        self.analysis_pool: Optional[AnalysisPool] = None
+        self.supervisor: Optional[ShardSupervisor] = None
+        self._tracker_lock = threading.Lock()  # notify workers share the signal tracker
+        self._in_flight = set()  # watchlist pairs somewhere in the pipeline
+        self._in_flight_lock = threading.Lock()
+        self._cycle_pending = None  # start of the oldest watchlist/shard cycle whose pairs aren't all done
+        self._cycle_lock = threading.Lock()
+        self.metrics = BotMetrics()
+        self.metrics_server: Optional[MetricsServer] = None
+        self._setup_metrics()
+        # Relative to the project, not to wherever the bot was started from
+        self.profiler = CycleProfiler(
+            report_dir=str(PROJECT_DIR / self.config.PROFILE_DIR),
+            top=self.config.PROFILE_TOP,
+            cycles=self.config.PROFILE_CYCLES,
+            trigger_file=str(PROJECT_DIR / self.config.PROFILE_TRIGGER_FILE) if self.config.PROFILE_TRIGGER_FILE else None
+        )
+        self.notification_queue.send_context = lambda: self.profiler.section("send_telegram")
+        install_signal_trigger(self.profiler)
+        self._resampler_key = None
+        self._closing_cycle = True  # False for intra-candle refreshes, which skip notifications
+        self._cache_misses_logged = 0
 
     def update_config(self, new_config):
         """Handle configuration updates more robustly"""
@@ -31,12 +83,13 @@ class BotManager:
                 self.config.available_pairs = self.exchange.get_available_pairs()
             
             # Reinitialize analyzers with new config
-            self.analyzer = Analyzer(self.config)
+            self.analyzer = Analyzer(self.config, cache=self.analysis_cache)
             self.notifier = Notifier(self.config)
+            self.notification_queue.notifier = self.notifier
+            self.signal_tracker = self._create_signal_tracker()
             
         except Exception as e:
-            if hasattr(self, 'window'):
-                self.window.log(f"Error updating config: {e}")
+            self.events.log(f"Error updating config: {e}", "ERROR")
             raise
         # self.config.save_config(new_config)
         # if new_config.get("EXCHANGE") != self.config.EXCHANGE:
@@ -49,6 +102,7 @@ class BotManager:
         if not self.running:
             self.running = True
             self.stop_event.clear()
+            self.notification_queue.start()
             self.thread = threading.Thread(target=self.run, daemon=True)
             self.thread.start()
 
@@ -56,6 +110,10 @@ class BotManager:
         if self.running:
             self.running = False
             self.stop_event.set()
+            self._stop_pipeline()
+            self._stop_supervisor()
+            # Queued messages are still flushed, without waiting for Telegram on the caller's thread
+            self.notification_queue.stop(timeout=0)
             # Don't join here - that's what causes the freeze
             self.thread = None
         # if self.thread:
@@ -85,6 +143,25 @@ class BotManager:
         while self.running and not self.stop_event.is_set():
             try:
                 start_time = time.time()
+                self.profiler.begin_cycle()
+
+                if self.config.SCAN_MODE:
+                    self._scan_cycle()
+                    self._record_cycle(start_time)
+                    self._precision_sleep(self._next_cycle_delay(start_time))
+                    continue
+
+                if self.config.WATCHLIST and self.config.SHARD_WORKERS > 0:
+                    self._shard_cycle()
+                    self._submitted_cycle(start_time, lambda: not self.supervisor.stats()['busy'])
+                    self._precision_sleep(self._next_cycle_delay(start_time))
+                    continue
+
+                if self.config.WATCHLIST:
+                    self._pipeline_cycle()
+                    self._submitted_cycle(start_time, self._pipeline_idle)
+                    self._precision_sleep(self._next_cycle_delay(start_time))
+                    continue
                 
                 # Validate pair availability
                 if hasattr(self.config, 'available_pairs') and \
@@ -93,15 +170,23 @@ class BotManager:
                     time.sleep(60)
                     continue
                     
-                # Fetch market data
-                df = self.exchange.get_ohlcv(
-                    symbol=self.config.SYMBOL,
-                    timeframe=self.config.TIMEFRAME
-                )
+                # Fetch market data, enough of it to rebuild the confirmation timeframes
+                resampler = self._get_resampler()
+                with self.metrics.fetch_seconds.time(symbol=self.config.SYMBOL), self.profiler.section("get_ohlcv"):
+                    df = self.exchange.get_ohlcv(
+                        symbol=self.config.SYMBOL,
+                        timeframe=self.config.TIMEFRAME,
+                        limit=max(100, resampler.base_candles_needed) if resampler else 100
+                    )
                 
                 # Analyze data
-                signal, latest_data = self.analyzer.analyze(df)
+                with self.metrics.analysis_seconds.time(symbol=self.config.SYMBOL), self.profiler.section("analyze"):
+                    signal, latest_data = self.analyzer.analyze(df)
                 latest_data['symbol'] = self.config.SYMBOL
+                if resampler is not None:
+                    resampler.update(self.exchange.get_cached_ohlcv(self.config.SYMBOL, self.config.TIMEFRAME))
+                    signal, trends = self.analyzer.confirm(signal, resampler.frames(self.config.SYMBOL))
+                    latest_data['trends'] = trends
                 
                 # # Prepare formatted message
                 # message = (
@@ -112,56 +197,372 @@ class BotManager:
                 #     f"Volume: {latest_data['volume']:.2f} | Signal: {signal}\n"
                 # )
                 # Prepare formatted message with type safety
-                message = (
-                    f"[{str(latest_data.get('timestamp', 'N/A'))}] {getattr(self.config, 'SYMBOL', 'N/A')} ({getattr(self.config, 'EXCHANGE', 'N/A').upper()})\n"
-                    f"Timeframe: {getattr(self.config, 'TIMEFRAME', 'N/A')} | Interval: {getattr(self.config, 'INTERVAL', 'N/A')} mins\n"
-                    f"RSI ({getattr(self.config, 'RSI_WINDOW', 7)}): {float(latest_data.get('rsi', 0)):.2f} | "
-                    f"MA{getattr(self.config, 'SMA_SHORT', 7)}: {float(latest_data.get('ma_short', 0)):.4f} | "
-                    f"MA{getattr(self.config, 'SMA_LONG', 25)}: {float(latest_data.get('ma_long', 0)):.4f}\n"
-                    f"MACD: {float(latest_data.get('macd', 0)):.4f} | Signal: {float(latest_data.get('macd_signal', 0)):.4f}\n"
-                    f"Volume: {float(latest_data.get('volume', 0)):.2f} | Spike Ratio: {float(getattr(self.config, 'VOLUME_SPIKE_RATIO', 1.5)):.1f}\n"
-                    f"---------------------\n"
-                    f"Price: {float(latest_data.get('close', 0)):.4f}\n"
-                    f"Signal: {str(signal)}\n"
-                    f"---------------------\n"
-                    f"Theme: {getattr(self.config, 'THEME', 'light').capitalize()}"
-                )
+                message = self._format_message(signal, latest_data)
                 
                 # Update UI
                 self._update_ui(signal, latest_data, message)
+                self._log_cache_stats()
                 
                 # Send notifications for important signals
-                if signal in ['BUY', 'SELL','HOLD'] and hasattr(self, 'notifier'):
-                    self.notifier.send_telegram(message)
+                if signal in ['BUY', 'SELL','HOLD'] and hasattr(self, 'notifier') and self._closing_cycle:
+                    self._notify(signal, latest_data, message)
                 
                 # Precision sleep with stop_event checking
-                elapsed = time.time() - start_time
-                remaining_sleep = max(0, self.config.INTERVAL - elapsed)
-                self._precision_sleep(remaining_sleep)
+                self._record_cycle(start_time)
+                self._precision_sleep(self._next_cycle_delay(start_time))
                 
             except Exception as e:
+                self._end_profiled_cycle()
                 self._log_error(f"Runtime error: {e}")
                 time.sleep(min(60, self.config.INTERVAL))  # Cap error delay at 60s
 
+        # Closed from this thread, a scan may still be using the scanner's event loop until here
+        self._close_scanner()
+
     def _update_ui(self, signal, latest_data, message):
-        """Helper method to update user interface."""
-        if hasattr(self, 'window'):
-            self.window.log(message)
-            self.window.update_stats(latest_data)
-            self.window.update_signal(signal)
-            self.window.signal_label.config(text=f"Signal: {signal}")
+        """Publish the cycle result, the UI thread renders it on its own schedule."""
+        self.metrics.signals.inc(signal=signal)
+        self.events.log(message)
+        self.events.stats(latest_data)
+        self.events.signal(signal)
+
+    def _scan_cycle(self):
+        """Scan every active USDT pair and publish the ranked BUY/SELL candidates."""
+        if self.scanner is None or self.scanner.exchange is not self.exchange:
+            if self.scanner is not None:
+                self.scanner.close()
+            self.scanner = MarketScanner(self.config, self.exchange, self.analyzer)
+        self.scanner.analyzer = self.analyzer
+
+        table = self.scanner.scan()
+        self.events.log(MarketScanner.format_table(table))
+        if table.empty:
+            return
+
+        top = table.iloc[0]
+        self.events.stats({**top.to_dict(), 'symbol': top.name})
+        self.events.signal(top['signal'])
+
+        if not self._closing_cycle:
+            return
+        for symbol, row in table.iterrows():
+            message = (
+                f"{symbol} ({self.config.EXCHANGE.upper()}) {self.config.TIMEFRAME}\n"
+                f"Price: {row['close']:.4f} | RSI: {row['rsi']:.2f} | 24h: {row['change_pct']:+.2f}%\n"
+                f"Signal: {row['signal']}"
+            )
+            if not self.config.NOTIFY_ON_CHANGE:
+                if row['signal'] != "HOLD":
+                    self.notification_queue.put(message, row['signal'])
+                continue
+            # Every pair goes through the tracker, so it sees a return to HOLD, but HOLDs aren't sent
+            key = (self.config.EXCHANGE, symbol, self.config.TIMEFRAME)
+            reason = self.signal_tracker.check(key, row['signal'], row.to_dict())
+            if reason and row['signal'] != "HOLD":
+                self.notification_queue.put(f"{message}\nReason: {reason}", row['signal'])
+
+        digest = self.signal_tracker.heartbeat() if self.config.NOTIFY_ON_CHANGE else None
+        if digest:
+            self.notification_queue.put(digest)
+
+    def _close_scanner(self):
+        if self.scanner is not None:
+            self.scanner.close()
+            self.scanner = None
+
+    def _pipeline_cycle(self):
+        """Queue every WATCHLIST pair on the fetch -> analyze -> notify pipeline."""
+        if self.pipeline is None:
+            self.analysis_pool = AnalysisPool(self.config.ANALYSIS_WORKERS, self.config.snapshot())
+            size = self.config.PIPELINE_QUEUE_SIZE
+            self.pipeline = Pipeline([
+                Stage("fetch", self._fetch_stage, self.config.FETCH_WORKERS, size),
+                Stage("analyze", self._analysis_stage, max(1, self.config.ANALYSIS_WORKERS), size),
+                Stage("notify", self._notify_stage, self.config.NOTIFY_WORKERS, size),
+            ], on_error=self._pipeline_error)
+            self.pipeline.start()
+        else:
+            self.events.log(self.pipeline.summary())
+
+        settings = self.config.snapshot()
+        busy = []
+        for symbol in [pair.strip() for pair in self.config.WATCHLIST.split(",") if pair.strip()]:
+            # A pair still on its way through from an earlier cycle isn't queued again
+            with self._in_flight_lock:
+                if symbol in self._in_flight:
+                    busy.append(symbol)
+                    continue
+                self._in_flight.add(symbol)
+            if not self.pipeline.submit((symbol, settings, self._closing_cycle)):
+                self._pipeline_done(symbol)
+                self._log_error(f"Pipeline full, skipping {symbol} this cycle")
+        if busy:
+            self._log_error(f"Still processing {', '.join(busy)} from the last cycle, skipping them this cycle")
+
+    def _pipeline_done(self, symbol):
+        with self._in_flight_lock:
+            self._in_flight.discard(symbol)
+            idle = not self._in_flight
+        if idle:
+            self._cycle_done()
+
+    def _pipeline_idle(self) -> bool:
+        with self._in_flight_lock:
+            return not self._in_flight
+
+    def _pipeline_error(self, stage, item, e):
+        self._pipeline_done(item[0])
+        self._log_error(f"{stage} {item[0]}: {e}")
+
+    def _fetch_stage(self, item):
+        symbol, settings, closing = item
+        with self.metrics.fetch_seconds.time(symbol=symbol), self.profiler.section("get_ohlcv"):
+            ohlcv = self.exchange.get_candles(symbol, settings.TIMEFRAME)
+        return symbol, settings, closing, ohlcv
+
+    def _analysis_stage(self, item):
+        symbol, settings, closing, ohlcv = item
+        with self.metrics.analysis_seconds.time(symbol=symbol), self.profiler.section("analyze"):
+            signal, latest_data = self.analysis_pool.analyze(settings, symbol, ohlcv)
+        return symbol, settings, closing, signal, latest_data
+
+    def _format_message(self, signal, latest_data):
+        """Signal message of the single-symbol loop, shown in the log and sent to Telegram"""
+        message = (
+            f"[{str(latest_data.get('timestamp', 'N/A'))}] {getattr(self.config, 'SYMBOL', 'N/A')} ({getattr(self.config, 'EXCHANGE', 'N/A').upper()})\n"
+            f"Timeframe: {getattr(self.config, 'TIMEFRAME', 'N/A')} | Interval: {getattr(self.config, 'INTERVAL', 'N/A')} mins\n"
+            f"RSI ({getattr(self.config, 'RSI_WINDOW', 7)}): {float(latest_data.get('rsi', 0)):.2f} | "
+            f"MA{getattr(self.config, 'SMA_SHORT', 7)}: {float(latest_data.get('ma_short', 0)):.4f} | "
+            f"MA{getattr(self.config, 'SMA_LONG', 25)}: {float(latest_data.get('ma_long', 0)):.4f}\n"
+            f"MACD: {float(latest_data.get('macd', 0)):.4f} | Signal: {float(latest_data.get('macd_signal', 0)):.4f}\n"
+            f"Volume: {float(latest_data.get('volume', 0)):.2f} | Spike Ratio: {float(getattr(self.config, 'VOLUME_SPIKE_RATIO', 1.5)):.1f}\n"
+            f"---------------------\n"
+            f"Price: {float(latest_data.get('close', 0)):.4f}\n"
+            f"Signal: {str(signal)}\n"
+            f"---------------------\n"
+            f"Theme: {getattr(self.config, 'THEME', 'light').capitalize()}"
+        )
+        if latest_data.get('trends'):
+            message += "\nTrend: " + " | ".join(f"{tf} {trend}" for tf, trend in latest_data['trends'].items())
+        return message
+
+    @staticmethod
+    def _format_watchlist_message(symbol, settings, signal, latest_data):
+        """Compact one-pair message of the watchlist pipeline and shards"""
+        return (
+            f"[{latest_data.get('timestamp', 'N/A')}] {symbol} ({settings.EXCHANGE.upper()}) {settings.TIMEFRAME}\n"
+            f"Price: {float(latest_data.get('close', 0)):.4f} | RSI ({settings.RSI_WINDOW}): {float(latest_data.get('rsi', 0)):.2f} | "
+            f"MACD: {float(latest_data.get('macd', 0)):.4f} / {float(latest_data.get('macd_signal', 0)):.4f}\n"
+            f"Signal: {signal}"
+        )
+
+    def _notify_stage(self, item):
+        try:
+            self._publish_result(item)
+        finally:
+            self._pipeline_done(item[0])
+
+    def _publish_result(self, item):
+        """Log, publish and notify one watchlist pair, for the pipeline and the shard workers"""
+        symbol, settings, closing, signal, latest_data = item
+        message = self._format_watchlist_message(symbol, settings, signal, latest_data)
+        self.events.log(message)
+        self.events.stats({**latest_data, 'symbol': symbol})
+        self.events.signal(signal)
+        self.metrics.signals.inc(signal=signal)
+        if closing:
+            with self._tracker_lock:
+                self._notify(signal, latest_data, message, symbol)
+
+    def _setup_metrics(self):
+        """Scrape-time readings of the queues and cache, and the METRICS_PORT endpoint"""
+        metrics = self.metrics
+        self.notification_queue.on_send = lambda seconds, ok: metrics.notify_seconds.observe(
+            seconds, result="ok" if ok else "error")
+        metrics.cache_lookups.set_function(lambda: {
+            ("hit",): self.analysis_cache.hits, ("miss",): self.analysis_cache.misses
+        } if self.analysis_cache is not None else {})
+        metrics.notifications.set_function(lambda: {
+            (outcome,): value for outcome, value in self.notification_queue.metrics().items()
+            if outcome in ("sent", "dropped", "retries", "failed")
+        })
+
+        def queue_depths():
+            depths = {("notifications",): self.notification_queue.depth}
+            if self.pipeline is not None:
+                depths.update({(f"pipeline_{stage.name}",): stage.queue.qsize() for stage in self.pipeline.stages})
+            return depths
+        metrics.queue_depth.set_function(queue_depths)
+
+        if self.config.METRICS_PORT > 0:
+            try:
+                self.metrics_server = MetricsServer(metrics.registry, self.config.METRICS_PORT)
+                self.metrics_server.start()
+                self.events.log(f"Metrics at http://127.0.0.1:{self.metrics_server.port}/metrics")
+            except OSError as e:
+                self._log_error(f"Metrics endpoint failed to start on port {self.config.METRICS_PORT}: {e}")
+
+    def _record_cycle(self, start_time):
+        self._observe_cycle(time.time() - start_time)
+        self._end_profiled_cycle()
+
+    def _observe_cycle(self, duration):
+        overrun = duration - self._cycle_period()
+        self.metrics.cycle_seconds.observe(duration)
+        self.metrics.cycle_overrun.set(overrun)
+        if overrun > 0:
+            self.metrics.cycle_overruns.inc()
+
+    def _submitted_cycle(self, start_time, idle):
+        """
+        Watchlist and shard cycles only hand the pairs to workers, so the cycle is
+        timed until `idle()` says they're all done, see _cycle_done. If work from an
+        earlier cycle is still running the cycles are timed together from the
+        first, the overrun gauge shows how far behind that one is meanwhile.
+        """
+        self._end_profiled_cycle()
+        with self._cycle_lock:
+            if self._cycle_pending is None:
+                self._cycle_pending = start_time
+            else:
+                self.metrics.cycle_overrun.set(time.time() - self._cycle_pending - self._cycle_period())
+            if idle():  # Nothing submitted, or it all finished already
+                self._observe_cycle(time.time() - self._cycle_pending)
+                self._cycle_pending = None
+
+    def _cycle_done(self):
+        """Every submitted pair is done, from a pipeline or shard collector thread"""
+        with self._cycle_lock:
+            if self._cycle_pending is not None:
+                self._observe_cycle(time.time() - self._cycle_pending)
+                self._cycle_pending = None
+
+    def _cycle_period(self) -> float:
+        """Seconds a cycle has before the next one is due"""
+        if self.config.SCHEDULE_MODE == "candle":
+            return self._get_scheduler().period
+        return self.config.INTERVAL
+
+    def _end_profiled_cycle(self):
+        report = self.profiler.end_cycle()
+        if report:
+            self.events.log(report)
+
+    def request_profile(self, cycles=None) -> str:
+        """Profile the next cycles of run(), as the UI button, SIGUSR1 or the trigger file do"""
+        cycles = self.profiler.request(cycles)
+        return f"Profiling the next {cycles} cycles, report goes to {self.profiler.report_dir}/"
+
+    def _shard_cycle(self):
+        """Have the shard worker processes analyze their part of WATCHLIST."""
+        symbols = [pair.strip() for pair in self.config.WATCHLIST.split(",") if pair.strip()]
+        if self.supervisor is None:
+            self.supervisor = ShardSupervisor(
+                self.config.SHARD_WORKERS,
+                on_result=self._publish_result,  # No pipeline bookkeeping, on_idle ends the cycle
+                on_error=self._log_error,
+                on_idle=self._cycle_done
+            )
+            self.supervisor.start(symbols)
+        else:
+            self.events.log(self.supervisor.summary())
+            self.supervisor.assign(symbols)
+        self.supervisor.cycle(self.config.snapshot(), self._closing_cycle)
+
+    def _stop_supervisor(self):
+        if self.supervisor is not None:
+            self.supervisor.stop()
+            self.supervisor = None
+        with self._cycle_lock:
+            self._cycle_pending = None
+
+    def _stop_pipeline(self):
+        if self.pipeline is not None:
+            self.pipeline.stop()
+            self.analysis_pool.shutdown()
+            self.pipeline = None
+            self.analysis_pool = None
+        with self._in_flight_lock:
+            self._in_flight.clear()
+        with self._cycle_lock:
+            self._cycle_pending = None
+
+    def _get_resampler(self) -> Optional[Resampler]:
+        """Resampler for CONFIRM_TIMEFRAMES, seeded from the exchange once per pair/timeframe setup"""
+        timeframes = [tf.strip() for tf in self.config.CONFIRM_TIMEFRAMES.split(",") if tf.strip()]
+        if not timeframes:
+            self.resampler = None
+            return None
+
+        key = (self.exchange.exchange_name, self.config.SYMBOL, self.config.TIMEFRAME, tuple(timeframes))
+        if self.resampler is None or self._resampler_key != key:
+            resampler = Resampler(self.config.TIMEFRAME, timeframes)
+            for timeframe in timeframes:
+                resampler.bootstrap(timeframe, self.exchange.fetch_history(self.config.SYMBOL, timeframe, resampler.limit))
+            self.resampler = resampler
+            self._resampler_key = key
+        return self.resampler
+
+    def _create_analysis_cache(self) -> Optional[AnalysisCache]:
+        if self.config.ANALYSIS_CACHE_MB <= 0:
+            return None
+        return AnalysisCache(max_bytes=int(self.config.ANALYSIS_CACHE_MB * 1024 * 1024))
+
+    def _log_cache_stats(self):
+        """Log the analysis cache hit ratio once per closed candle, i.e. after each miss"""
+        if self.analysis_cache is not None and self.analysis_cache.misses != self._cache_misses_logged:
+            self._cache_misses_logged = self.analysis_cache.misses
+            self.events.log(self.analysis_cache.summary())
+
+    def _create_signal_tracker(self):
+        return SignalTracker(
+            price_change_pct=self.config.PRICE_CHANGE_PCT,
+            heartbeat_interval=self.config.HEARTBEAT_INTERVAL
+        )
+
+    def _notify(self, signal, latest_data, message, symbol=None):
+        """Queue the message if it says something new, plus the periodic heartbeat digest."""
+        if not self.config.NOTIFY_ON_CHANGE:
+            self.notification_queue.put(message, signal)
+            return
+
+        key = (self.config.EXCHANGE, symbol or self.config.SYMBOL, self.config.TIMEFRAME)
+        reason = self.signal_tracker.check(key, signal, latest_data)
+        if reason:
+            self.notification_queue.put(f"{message}\nReason: {reason}", signal)
+
+        digest = self.signal_tracker.heartbeat()
+        if digest:
+            self.notification_queue.put(digest)
+
+    def _next_cycle_delay(self, start_time):
+        """Seconds until the next cycle: a fixed INTERVAL, or aligned to the next candle close."""
+        if self.config.SCHEDULE_MODE != "candle":
+            self._closing_cycle = True
+            return max(0, self.config.INTERVAL - (time.time() - start_time))
+
+        scheduler = self._get_scheduler()
+        if scheduler.clock_stale():
+            scheduler.sync_clock(self.exchange.get_clock_offset())
+
+        delay, self._closing_cycle = scheduler.next_run()
+        return delay
+
+    def _get_scheduler(self) -> CandleScheduler:
+        if self.scheduler is None or self.scheduler.timeframe != self.config.TIMEFRAME:
+            self.scheduler = CandleScheduler(self.config.TIMEFRAME)
+        self.scheduler.close_delay_ms = self.config.CANDLE_CLOSE_DELAY_MS
+        self.scheduler.refresh_interval = self.config.CANDLE_REFRESH_INTERVAL
+        return self.scheduler
 
     def _precision_sleep(self, duration):
-        """Sleep with frequent stop_event checks."""
-        for _ in range(int(duration * 10)):
-            if self.stop_event.is_set():
-                break
-            time.sleep(0.1)
+        """Sleep until duration has passed or stop_event is set."""
+        self.stop_event.wait(max(0, duration))
 
     def _log_error(self, message):
         """Centralized error logging."""
-        if hasattr(self, 'window'):
-            self.window.log(message)
+        self.metrics.errors.inc()
+        self.events.log(message, "ERROR")
         print(message)  # Also log to console if needed
     # def run(self):
     #     while self.running and not self.stop_event.is_set():
@@ -195,11 +596,56 @@ class BotManager:
     #                 self.window.log(f"Error: {e}")
     #             time.sleep(5)  # Brief pause after error
 
-if __name__ == "__main__":
+def run_optimizer(args):
+    """Backtest a parameter sweep over SYMBOL/TIMEFRAME history and print the ranked combinations"""
+    config = Config()
+    if args.payload:
+        with open(args.payload) as f:
+            rows = json.load(f)
+        source = args.payload
+    else:
+        rows = Exchange(config.EXCHANGE).fetch_history(config.SYMBOL, config.TIMEFRAME, args.candles)
+        source = f"{config.SYMBOL} {config.TIMEFRAME} on {config.EXCHANGE}"
+    candles = parse_ohlcv(rows)
+
+    optimizer = Optimizer(candles[:, 4], candles[:, 5], metric=args.metric)
+    started = time.perf_counter()
+    results = optimizer.run(mode=args.mode, samples=args.samples, seed=args.seed)
+    print(f"{len(results)} combinations over {len(candles)} candles of {source}, "
+          f"{args.mode} search in {time.perf_counter() - started:.1f}s, ranked by {args.metric}")
+    print(format_results(results, args.top))
+
+def main():
+    parser = argparse.ArgumentParser(description="Creepy Bot")
+    parser.add_argument("--headless", action="store_true", help="run without the Tk window (the ui package is never imported)")
+    parser.add_argument("--log-file", help="headless mode: write logs to this file instead of stderr")
+    parser.add_argument("--optimize", action="store_true", help="print a ranked backtest of signal parameters and exit")
+    parser.add_argument("--mode", choices=["random", "grid", "halving"], default="random", help="optimize: search mode")
+    parser.add_argument("--samples", type=int, default=500, help="optimize: combinations tried by random and halving")
+    parser.add_argument("--candles", type=int, default=1000, help="optimize: candles of history to fetch")
+    parser.add_argument("--payload", help="optimize: ccxt OHLCV rows (JSON) to use instead of fetching")
+    parser.add_argument("--metric", default="total_return", help="optimize: backtest result to rank by")
+    parser.add_argument("--top", type=int, default=20, help="optimize: rows to print")
+    parser.add_argument("--seed", type=int, default=0, help="optimize: random sample seed")
+    args = parser.parse_args()
+
+    if args.optimize:
+        run_optimizer(args)
+        return
+
     bot_manager = BotManager()
+    if args.headless:
+        run_headless(bot_manager, STARTED_AT, args.log_file)
+        return
+
+    from ui.main_window import MainWindow
     window = MainWindow(bot_manager)
     bot_manager.window = window
+    window.log(startup_report("gui", STARTED_AT))
     window.mainloop()
+
+if __name__ == "__main__":
+    main()
 # from bot.config import Config
 # from bot.exchange import Exchange
 # from bot.analyzer import Analyzer
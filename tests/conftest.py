@@ -0,0 +1,28 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# The bot is run from the repo root rather than installed, make `bot` importable the same way
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+def _candles(n, seed):
+    """
+    Random walk ending in a crash and a slow rebound, followed by its mirror
+    image (M - price). The rebound is where the BUY conditions line up, and
+    mirroring flips RSI around 50 and every MA/MACD comparison so it comes
+    back as SELL rows and both masks get exercised.
+    """
+    rng = np.random.default_rng(seed)
+    walk = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    rebound = walk[-1] * np.concatenate([1 + 0.002 * np.sin(np.arange(30)), 0.5 + 0.001 * np.arange(80)])
+    path = np.concatenate([walk, rebound])
+    close = np.concatenate([path, 2 * path.max() - path])
+    volume = np.tile(rng.lognormal(6, 0.4, len(path)) * np.where(rng.random(len(path)) < 0.3, 4, 1), 2)
+    return close, volume
+
+@pytest.fixture(scope="session")
+def make_candles():
+    """make_candles(n, seed) -> (close, volume) of 2 * (n + 110) candles with BUY and SELL rows"""
+    return _candles
@@ -0,0 +1,84 @@
+import asyncio
+import time
+
+import pytest
+
+from bot.async_exchange import AsyncExchange
+
+HOUR_MS = 60 * 60 * 1000
+
+class FakeAsyncClient:
+    """ccxt.async_support stand-in: each symbol answers after its own latency, and the peak of requests in flight is kept"""
+
+    def __init__(self, latencies, fail=()):
+        self.latencies = latencies
+        self.fail = set(fail)
+        self.in_flight = self.peak = 0
+        self.closed = False
+
+    async def fetch_ohlcv(self, symbol, timeframe="1h", limit=100):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.latencies[symbol])
+        finally:
+            self.in_flight -= 1
+        if symbol in self.fail:
+            raise ConnectionError(f"{symbol} timed out")
+        return [[i * HOUR_MS, 1.0, 2.0, 0.5, 1.5, 10.0] for i in range(limit)]
+
+    async def close(self):
+        self.closed = True
+
+def _latencies(n):
+    return {f"PAIR{i}/USDT": 0.05 + 0.15 * i / (n - 1) for i in range(n)}
+
+@pytest.fixture
+def exchange():
+    created = []
+
+    def make(latencies, **kwargs):
+        created.append(AsyncExchange(client=FakeAsyncClient(latencies, kwargs.pop("fail", ())), **kwargs))
+        return created[-1]
+
+    yield make
+    for instance in created:
+        instance.close()
+
+def test_batch_takes_the_slowest_request_not_the_sum(exchange):
+    latencies = _latencies(10)
+    fetcher = exchange(latencies)
+    started = time.perf_counter()
+    data = fetcher.gather_ohlcv(list(latencies), "1h", limit=50)
+    elapsed = time.perf_counter() - started
+
+    assert sorted(data) == sorted(latencies)
+    assert all(len(frame) == 50 for frame in data.values())
+    assert fetcher.client.peak == len(latencies)
+    # 0.2 s for the slowest request against 1.25 s in sequence
+    assert max(latencies.values()) <= elapsed < max(latencies.values()) + 0.25 < sum(latencies.values())
+
+def test_max_concurrency_caps_requests_in_flight(exchange):
+    latencies = dict.fromkeys(_latencies(8), 0.05)
+    fetcher = exchange(latencies, max_concurrency=2)
+    started = time.perf_counter()
+    fetcher.gather_ohlcv(list(latencies), "1h", as_arrays=True)
+
+    assert fetcher.client.peak == 2
+    assert time.perf_counter() - started >= 4 * 0.05  # 8 requests, 2 at a time
+
+def test_failed_symbols_are_kept_apart(exchange):
+    latencies = _latencies(4)
+    fetcher = exchange(latencies, fail=["PAIR1/USDT"])
+    data = fetcher.gather_ohlcv(list(latencies), "1h", as_arrays=True)
+
+    assert sorted(data) == ["PAIR0/USDT", "PAIR2/USDT", "PAIR3/USDT"]
+    assert data["PAIR0/USDT"].shape == (100, 6)
+    assert isinstance(fetcher.last_errors["PAIR1/USDT"], ConnectionError)
+
+def test_close_closes_the_client(exchange):
+    fetcher = exchange(_latencies(2))
+    fetcher.gather_ohlcv(["PAIR0/USDT"], "1h")
+    client = fetcher.client
+    fetcher.close()
+    assert client.closed
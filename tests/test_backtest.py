@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from bot import backtest as backtest_module
+from bot.backtest import RESULT_KEYS, backtest
+
+SETTINGS = dict(rsi_window=14, sma_short=7, sma_long=25, bb_window=20, volume_spike_ratio=1.5)
+
+@pytest.fixture
+def signals(monkeypatch):
+    """Replace the signal rules with fixed BUY/SELL rows"""
+    def use(buy_rows, sell_rows, n):
+        buy, sell = np.zeros(n, bool), np.zeros(n, bool)
+        buy[buy_rows] = True
+        sell[sell_rows] = True
+        monkeypatch.setattr(backtest_module.kernels, "signal_masks", lambda values: (buy, sell))
+    return use
+
+def test_equity_matches_hand_computed_series(signals):
+    close = np.array([100.0, 110.0, 99.0, 120.0, 108.0, 130.0])
+    signals(buy_rows=[1, 2, 4], sell_rows=[3], n=len(close))  # The BUY at 2 is already long
+    fee, slippage = 0.001, 0.0005
+    entry = (1 - fee) / (1 + slippage)
+    exit = (1 - fee) * (1 - slippage)
+
+    # Long from the close of candle 1 to candle 3, then from 4 to the forced exit at 5
+    equity = [1.0, entry, entry * 99 / 110, entry * 120 / 110 * exit]
+    equity += [equity[-1] * entry, equity[-1] * entry * 130 / 108 * exit]
+    equity = np.array(equity)
+    trades = np.array([120 / 110 * entry * exit - 1, 130 / 108 * entry * exit - 1])
+
+    result = backtest(close, np.ones(len(close)), fee=fee, slippage=slippage, **SETTINGS)
+    assert result['total_return'] == pytest.approx(equity[-1] - 1, rel=1e-12)
+    assert result['max_drawdown'] == pytest.approx((equity / np.maximum.accumulate(equity) - 1).min(), rel=1e-12)
+    assert result['buy_hold_return'] == pytest.approx(0.3)
+    assert result['trades'] == 2
+    assert result['win_rate'] == 1.0
+    assert result['avg_trade_return'] == pytest.approx(trades.mean(), rel=1e-12)
+    assert result['best_trade'] == pytest.approx(trades.max(), rel=1e-12)
+    assert result['worst_trade'] == pytest.approx(trades.min(), rel=1e-12)
+    assert result['exposure'] == pytest.approx(3 / 6)
+
+def test_no_signals_stays_flat(signals):
+    close = np.linspace(100, 150, 50)
+    signals(buy_rows=[], sell_rows=[], n=len(close))
+    result = backtest(close, np.ones(len(close)), **SETTINGS)
+    assert result['total_return'] == 0.0
+    assert result['trades'] == 0
+    assert result['exposure'] == 0.0
+
+def test_empty_history():
+    result = backtest(np.array([]), np.array([]), **SETTINGS)
+    assert set(result) == set(RESULT_KEYS)
+    assert result['trades'] == 0
+    assert all(value == 0.0 for value in result.values())
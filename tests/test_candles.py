@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+from bot.candles import CandleBuffer
+
+HOUR_MS = 60 * 60 * 1000
+
+def _rows(start, count, price=100.0):
+    """ccxt-shaped candles one hour apart, values derived from the timestamp so they're easy to tell apart"""
+    return [[(start + i) * HOUR_MS, price + i, price + i + 1, price + i - 1, price + i + 0.5, 10.0 + i]
+            for i in range(count)]
+
+def _reference_merge(held, rows, capacity):
+    """CandleBuffer.merge on a plain list"""
+    if held:
+        last = held[-1][0]
+        rows = [row for row in rows if row[0] >= last]
+        if rows and rows[0][0] == last:
+            held[-1] = rows[0]
+            rows = rows[1:]
+    return (held + rows)[-capacity:]
+
+def _assert_holds(buffer, expected):
+    np.testing.assert_array_equal(buffer.to_array(), np.array(expected, dtype=np.float64).reshape(-1, 6))
+
+def test_merge_overlap_replaces_forming_candle_and_ignores_older():
+    buffer = CandleBuffer.from_rows(_rows(0, 5), capacity=10)
+    revised = _rows(2, 6, price=200.0)  # Starts 2 candles before the newest held one
+    buffer.merge(revised)
+    _assert_holds(buffer, _rows(0, 4) + revised[2:])
+    assert buffer.last_timestamp == 7 * HOUR_MS
+
+def test_merge_gap_appends_after_missing_candles():
+    buffer = CandleBuffer.from_rows(_rows(0, 3), capacity=10)
+    buffer.merge(_rows(6, 2))
+    _assert_holds(buffer, _rows(0, 3) + _rows(6, 2))
+    np.testing.assert_array_equal(np.diff(buffer.timestamps) // HOUR_MS, [1, 1, 4, 1])
+
+def test_merge_older_than_held_is_ignored():
+    buffer = CandleBuffer.from_rows(_rows(10, 3), capacity=10)
+    buffer.merge(_rows(0, 5))
+    _assert_holds(buffer, _rows(10, 3))
+
+def test_merge_wraps_storage_past_twice_the_capacity():
+    capacity = 7
+    buffer = CandleBuffer(capacity)
+    held = []
+    rng = np.random.default_rng(0)
+    next_start = 0
+    for step in range(200):
+        # Overlap the newest candle, sometimes skip ahead, sometimes more than the capacity at once
+        start = max(next_start - int(rng.integers(0, 3)), 0) + int(rng.integers(0, 2) * rng.integers(0, 4))
+        count = int(rng.integers(1, 2 * capacity + 3))
+        rows = _rows(start, count, price=float(step))
+        buffer.merge(rows)
+        held = _reference_merge(held, rows, capacity)
+        next_start = start + count
+        _assert_holds(buffer, held)
+        assert len(buffer) == len(held) <= capacity
+
+def test_to_frame_matches_rows():
+    rows = _rows(0, 4)
+    df = CandleBuffer.from_rows(rows).to_frame("BTC/USDT")
+    assert df.attrs['symbol'] == "BTC/USDT"
+    assert list(df['timestamp']) == list(pd.to_datetime([row[0] for row in rows], unit='ms'))
+    np.testing.assert_array_equal(df[['open', 'high', 'low', 'close', 'volume']].values,
+                                  np.array(rows)[:, 1:])
@@ -0,0 +1,77 @@
+import threading
+import time
+
+from bot.events import EventChannel
+from bot.metrics import BotMetrics
+from bot.supervisor import ShardSupervisor
+from main import BotManager
+
+class Settings:
+    SCHEDULE_MODE = "interval"
+    INTERVAL = 60
+    EXCHANGE = "binance"
+    TIMEFRAME = "1h"
+    RSI_WINDOW = 14
+
+def _manager():
+    """BotManager with only what the cycle bookkeeping needs, no exchange connection"""
+    manager = BotManager.__new__(BotManager)
+    manager.config = Settings()
+    manager.events = EventChannel()
+    manager.metrics = BotMetrics()
+    manager._tracker_lock = threading.Lock()
+    manager._in_flight = set()
+    manager._in_flight_lock = threading.Lock()
+    manager._cycle_pending = None
+    manager._cycle_lock = threading.Lock()
+    manager.observed = []
+    manager._observe_cycle = manager.observed.append
+    manager._end_profiled_cycle = lambda: None
+    return manager
+
+LATEST = {'close': 1.0, 'rsi': 50.0, 'macd': 0.0, 'macd_signal': 0.0}
+
+def _result(worker_id, symbol):
+    """A shard worker's result message"""
+    return ("result", worker_id, symbol, "HOLD", LATEST, Settings(), False)
+
+def _item(symbol):
+    """A pair reaching the pipeline's notify stage"""
+    return (symbol, Settings(), False, "HOLD", LATEST)
+
+def test_shard_cycle_ends_with_the_last_done():
+    manager = _manager()
+    supervisor = ShardSupervisor(2, on_result=manager._publish_result, on_error=print, on_idle=manager._cycle_done)
+    supervisor._busy = {0, 1}
+    collector = threading.Thread(target=supervisor._collect, daemon=True)
+    collector.start()
+    try:
+        manager._submitted_cycle(time.time(), lambda: not supervisor.stats()['busy'])
+        for message in (_result(0, "A/USDT"), _result(1, "B/USDT"), ("done", 0, 1, 0.1)):
+            supervisor._results.put(message)
+        time.sleep(0.5)
+        assert manager.observed == []  # Worker 1 is still busy
+        assert len(manager.events.drain()[0]) == 2
+
+        supervisor._results.put(("done", 1, 1, 0.1))
+        time.sleep(0.5)
+        assert len(manager.observed) == 1
+        assert manager._cycle_pending is None
+    finally:
+        supervisor._stop_event.set()
+        collector.join()
+
+def test_pipeline_cycle_ends_when_the_last_pair_is_done():
+    manager = _manager()
+    manager._in_flight.update({"A/USDT", "B/USDT"})
+    manager._submitted_cycle(time.time(), manager._pipeline_idle)
+
+    manager._notify_stage(_item("A/USDT"))
+    assert manager.observed == []
+    manager._notify_stage(_item("B/USDT"))
+    assert len(manager.observed) == 1
+
+def test_cycle_with_nothing_submitted_ends_right_away():
+    manager = _manager()
+    manager._submitted_cycle(time.time(), manager._pipeline_idle)
+    assert len(manager.observed) == 1
@@ -0,0 +1,39 @@
+import logging
+import os
+import signal
+
+import pytest
+
+from bot import daemon
+from bot.events import EventChannel
+
+class FakeBotManager:
+    """Asks to be stopped as soon as it starts, and logs once more while stopping, like a cycle finishing"""
+
+    def __init__(self):
+        self.events = EventChannel()
+        self.notification_queue = type("Queue", (), {"stop": lambda self: None})()
+
+    def start(self):
+        os.kill(os.getpid(), signal.SIGTERM)
+
+    def stop(self):
+        self.events.log("BTC/USDT: BUY")
+        self.events.log("ETH/USDT: fetch failed", "ERROR")
+
+@pytest.fixture
+def restore_signals():
+    handlers = {sig: signal.getsignal(sig) for sig in (signal.SIGINT, signal.SIGTERM)}
+    yield
+    for sig, handler in handlers.items():
+        signal.signal(sig, handler)
+    logging.getLogger("creepybot").handlers.clear()
+
+def test_logs_posted_while_stopping_are_written(tmp_path, restore_signals):
+    log_file = tmp_path / "bot.log"
+    daemon.run_headless(FakeBotManager(), started_at=0.0, log_file=str(log_file))
+
+    lines = log_file.read_text().splitlines()
+    assert lines[-3].endswith("INFO BTC/USDT: BUY")
+    assert lines[-2].endswith("ERROR ETH/USDT: fetch failed")
+    assert lines[-1].endswith("INFO Bot stopped")
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+from ta.momentum import RSIIndicator
+from ta.trend import MACD, SMAIndicator
+from ta.volatility import BollingerBands
+
+from bot import kernels
+from bot.analyzer import Analyzer
+
+RTOL = 1e-9
+
+def _assert_same(actual, expected):
+    expected = np.asarray(expected, dtype=np.float64)
+    np.testing.assert_array_equal(np.isnan(actual), np.isnan(expected))
+    np.testing.assert_allclose(actual, expected, rtol=RTOL, atol=1e-9, equal_nan=True)
+
+@pytest.fixture(scope="module")
+def series(make_candles):
+    close, volume = make_candles(20000, seed=0)
+    return pd.Series(close), pd.Series(volume)
+
+@pytest.mark.parametrize("window", [2, 7, 14, 30])
+def test_rsi_matches_ta(series, window):
+    close, _ = series
+    _assert_same(kernels.rsi(close.values, window), RSIIndicator(close=close, window=window).rsi())
+
+@pytest.mark.parametrize("window", [1, 7, 25, 200])
+def test_sma_matches_ta(series, window):
+    close, _ = series
+    _assert_same(kernels.sma(close.values, window), SMAIndicator(close=close, window=window).sma_indicator())
+
+def test_macd_matches_ta(series):
+    close, _ = series
+    expected = MACD(close=close)
+    line, signal = kernels.macd(close.values)
+    _assert_same(line, expected.macd())
+    _assert_same(signal, expected.macd_signal())
+
+@pytest.mark.parametrize("window", [5, 20, 50])
+def test_bollinger_matches_ta(series, window):
+    close, _ = series
+    expected = BollingerBands(close=close, window=window, window_dev=2)
+    upper, lower = kernels.bollinger(close.values, window)
+    _assert_same(upper, expected.bollinger_hband())
+    _assert_same(lower, expected.bollinger_lband())
+
+def test_kernels_accept_2d_rows(series):
+    close, _ = series
+    rows = np.stack([close.values, close.values[::-1].copy()])
+    _assert_same(kernels.rsi(rows, 14)[1], RSIIndicator(close=pd.Series(rows[1]), window=14).rsi())
+
+def test_signal_masks_match_generate_signal(series):
+    close, volume = series
+    config = type("Settings", (), {"RSI_WINDOW": 14, "SMA_SHORT": 7, "SMA_LONG": 25,
+                                    "BB_WINDOW": 20, "VOLUME_SPIKE_RATIO": 1.5})()
+    analyzer = Analyzer(config)
+
+    values = kernels.indicators(close.values, volume.values, rsi_window=14, sma_short=7,
+                                sma_long=25, bb_window=20, volume_spike_ratio=1.5)
+    buy, sell = kernels.signal_masks({**values, 'close': close.values})
+
+    df = pd.DataFrame({'close': close, 'volume': volume})
+    df['rsi'] = RSIIndicator(close=close, window=14).rsi()
+    df['ma_short'] = SMAIndicator(close=close, window=7).sma_indicator()
+    df['ma_long'] = SMAIndicator(close=close, window=25).sma_indicator()
+    macd = MACD(close=close)
+    df['macd'] = macd.macd()
+    df['macd_signal'] = macd.macd_signal()
+    df['volume_spike'] = volume > volume.rolling(window=10).mean() * 1.5
+    expected = np.array([analyzer._generate_signal(row) for row in df.to_dict('records')])
+
+    assert (expected == "BUY").any() and (expected == "SELL").any()
+    np.testing.assert_array_equal(buy, expected == "BUY")
+    np.testing.assert_array_equal(sell, expected == "SELL")
@@ -0,0 +1,34 @@
+import pytest
+
+from benchmarks.telegram_stub import TelegramStub
+from bot.notifier import FAILED, RETRY, SENT, NotificationQueue, Notifier
+
+class Settings:
+    TELEGRAM_TOKEN = "token"
+    TELEGRAM_CHAT_ID = "1"
+
+@pytest.mark.parametrize("status, expected, hits", [
+    (200, SENT, 1),
+    (503, RETRY, 3),   # The session's own retries run out first, the queue may still try later
+    (429, RETRY, 3),
+    (400, FAILED, 1),  # Bad chat or message, retrying can't help
+    (401, FAILED, 1),
+])
+def test_send_classifies_the_response(status, expected, hits):
+    with TelegramStub(status) as stub:
+        assert Notifier(Settings(), api_url=stub.url).send("BTC/USDT BUY") == expected
+        assert stub.hits == hits
+
+def test_queue_retries_transient_errors_only():
+    with TelegramStub(503) as stub:
+        queue = NotificationQueue(Notifier(Settings(), api_url=stub.url), max_retries=1, retry_delay=0.01)
+        queue._send_with_retry("BTC/USDT BUY", 1)
+        assert queue.metrics()["retries"] == 1
+        assert queue.metrics()["failed"] == 1
+        assert stub.hits == 6  # Two queue attempts of three requests each
+
+    with TelegramStub(400) as stub:
+        queue = NotificationQueue(Notifier(Settings(), api_url=stub.url), max_retries=1, retry_delay=0.01)
+        queue._send_with_retry("BTC/USDT BUY", 1)
+        assert queue.metrics()["retries"] == 0
+        assert stub.hits == 1
@@ -0,0 +1,22 @@
+from bot.backtest import backtest
+from bot.optimizer import Optimizer, format_results
+
+RANGES = {'rsi_window': [7, 14], 'sma_short': [5, 7], 'sma_long': [25], 'volume_spike_ratio': [1.2, 1.5]}
+
+def test_grid_ranks_every_combination_like_backtest(make_candles):
+    close, volume = make_candles(2000, seed=0)
+    results = Optimizer(close, volume, ranges=RANGES, workers=2).run(mode='grid')
+
+    assert len(results) == 8
+    assert results['total_return'].is_monotonic_decreasing
+    for row in results.to_dict('records'):
+        params = {name: row[name] for name in RANGES}
+        expected = backtest(close, volume, bb_window=20, **params)
+        assert {key: row[key] for key in expected} == expected
+
+def test_format_results_shows_top_rows_as_percentages(make_candles):
+    close, volume = make_candles(2000, seed=0)
+    results = Optimizer(close, volume, ranges=RANGES, workers=1).run(mode='random', samples=3)
+    lines = format_results(results, top=2).splitlines()
+    assert len(lines) == 3  # Header and two rows
+    assert lines[1].split()[0] == "1" and "%" in lines[1]
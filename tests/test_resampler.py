@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bot.resampler import Resampler, bucket_start
+
+HOUR_MS = 60 * 60 * 1000
+
+def _base_candles(n, seed=0):
+    """1h candles starting mid-week at 05:00 UTC, with a few hours missing"""
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2024-01-03 05:00", tz="UTC").value // 1_000_000
+    hours = np.flatnonzero(rng.random(n) > 0.05)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    return [[start + int(hour) * HOUR_MS, close[hour] * 0.999, close[hour] * 1.01, close[hour] * 0.99,
+             close[hour], float(rng.lognormal(6, 0.5))] for hour in hours]
+
+def _pandas_resample(candles, rule, origin):
+    df = pd.DataFrame(candles, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+    df.index = pd.to_datetime(df['timestamp'], unit='ms')
+    resampled = df.resample(rule, origin=origin, label='left', closed='left').agg(
+        {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+    ).dropna()  # Buckets without base candles, the exchange has no candle for them either
+    timestamps = resampled.index.as_unit("ms").asi8.astype(np.float64)
+    return np.column_stack([timestamps, resampled.values])
+
+@pytest.mark.parametrize("timeframe, rule, origin", [
+    ("4h", "4h", "epoch"),
+    ("1d", "24h", "epoch"),
+    ("1w", "168h", pd.Timestamp("1970-01-05")),  # Weeks open on Monday
+])
+def test_buckets_match_dataframe_resample(timeframe, rule, origin):
+    candles = _base_candles(24 * 60)
+    resampler = Resampler("1h", [timeframe], limit=10_000)
+    for chunk in range(0, len(candles), 50):  # Overlapping batches, as successive fetches return them
+        resampler.update(candles[max(chunk - 3, 0):chunk + 50])
+
+    np.testing.assert_allclose(np.array(resampler.get_ohlcv(timeframe)),
+                               _pandas_resample(candles, rule, origin), rtol=1e-12)
+
+def test_revised_forming_candle_is_reaggregated():
+    candles = _base_candles(10)
+    resampler = Resampler("1h", ["4h"])
+    resampler.update(candles)
+    revised = list(candles[-1])
+    revised[2], revised[4], revised[5] = revised[2] * 2, revised[4] * 1.5, 0.0
+    resampler.update([revised])
+
+    np.testing.assert_allclose(np.array(resampler.get_ohlcv("4h")),
+                               _pandas_resample(candles[:-1] + [revised], "4h", "epoch"), rtol=1e-12)
+
+def test_bucket_start_alignment():
+    monday = pd.Timestamp("2024-01-08", tz="UTC").value // 1_000_000
+    assert bucket_start(monday + 3 * 24 * HOUR_MS + 5, "1w") == monday
+    assert bucket_start(monday - 1, "1w") == monday - 7 * 24 * HOUR_MS
+    assert bucket_start(monday + 7 * HOUR_MS, "4h") == monday + 4 * HOUR_MS
+
+def test_rejects_timeframes_that_are_not_multiples():
+    with pytest.raises(ValueError):
+        Resampler("3m", ["5m"])
+    with pytest.raises(ValueError):
+        Resampler("1h", ["1M"])
@@ -0,0 +1,18 @@
+from bot.scheduler import CandleScheduler
+
+HOUR_MS = 60 * 60 * 1000
+
+def test_next_run_waits_for_close_plus_delay():
+    scheduler = CandleScheduler("1h", close_delay_ms=300)
+    assert scheduler.next_run(now_ms=10 * HOUR_MS - 1000) == (1.3, True)
+    assert scheduler.next_run(now_ms=10 * HOUR_MS + 100) == (0.2, True)  # Still inside the delay window
+
+def test_refreshes_while_the_candle_forms():
+    scheduler = CandleScheduler("1h", close_delay_ms=0, refresh_interval=60)
+    assert scheduler.next_run(now_ms=10 * HOUR_MS + 1000) == (60, False)
+    assert scheduler.next_run(now_ms=11 * HOUR_MS - 30_000) == (30, True)
+
+def test_period():
+    assert CandleScheduler("1h").period == 3600
+    assert CandleScheduler("15m", refresh_interval=60).period == 60
+    assert CandleScheduler("1m", refresh_interval=120).period == 60  # Refreshing less often than candles close does nothing
@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytest
+from ta.momentum import RSIIndicator
+from ta.trend import MACD, SMAIndicator
+from ta.volatility import BollingerBands
+
+from bot.analyzer import Analyzer
+from bot.streaming import StreamingIndicators
+
+HOUR_MS = 60 * 60 * 1000
+WINDOWS = dict(rsi_window=14, sma_short=7, sma_long=25, bb_window=20)
+KEYS = ['rsi', 'ma_short', 'ma_long', 'macd', 'macd_signal', 'bb_upper', 'bb_lower', 'avg_volume']
+
+class Settings:
+    ANALYZER_BACKEND = "streaming"
+    TIMEFRAME = "1h"
+    RSI_WINDOW = 14
+    SMA_SHORT = 7
+    SMA_LONG = 25
+    BB_WINDOW = 20
+    VOLUME_SPIKE_RATIO = 1.5
+
+def _ta(close, volume) -> pd.DataFrame:
+    """The indicator columns Analyzer's "ta" backend computes, over the whole series"""
+    close, volume = pd.Series(close), pd.Series(volume)
+    macd = MACD(close=close)
+    bb = BollingerBands(close=close, window=WINDOWS['bb_window'], window_dev=2)
+    return pd.DataFrame({
+        'rsi': RSIIndicator(close=close, window=WINDOWS['rsi_window']).rsi(),
+        'ma_short': SMAIndicator(close=close, window=WINDOWS['sma_short']).sma_indicator(),
+        'ma_long': SMAIndicator(close=close, window=WINDOWS['sma_long']).sma_indicator(),
+        'macd': macd.macd(),
+        'macd_signal': macd.macd_signal(),
+        'bb_upper': bb.bollinger_hband(),
+        'bb_lower': bb.bollinger_lband(),
+        'avg_volume': volume.rolling(window=10).mean(),
+    })
+
+def _assert_matches(values, expected):
+    actual = np.array([values[key] for key in KEYS], dtype=np.float64)
+    np.testing.assert_allclose(actual, expected[KEYS].to_numpy(dtype=np.float64),
+                               rtol=1e-9, atol=1e-9, equal_nan=True)
+
+@pytest.fixture(scope="module")
+def series(make_candles):
+    close, volume = make_candles(1000, seed=1)
+    return close, volume, _ta(close, volume)
+
+def test_push_matches_ta_on_every_candle(series):
+    close, volume, expected = series
+    engine = StreamingIndicators(**WINDOWS)
+    for i in range(len(close)):
+        engine.update(i * HOUR_MS, close[i], volume[i])
+        _assert_matches(engine.values(), expected.iloc[i])
+
+def test_revising_the_forming_candle_matches_ta(series):
+    close, volume, expected = series
+    rng = np.random.default_rng(2)
+    engine = StreamingIndicators(**WINDOWS)
+    for i in range(len(close)):
+        # The forming candle moves a few times before it closes at its final values
+        for move in rng.normal(0, 0.02, 3):
+            engine.update(i * HOUR_MS, close[i] * (1 + move), volume[i] * (1 + abs(move)))
+            if i % 250 == 0 and i:
+                forming_close, forming_volume = close[:i + 1].copy(), volume[:i + 1].copy()
+                forming_close[-1], forming_volume[-1] = close[i] * (1 + move), volume[i] * (1 + abs(move))
+                _assert_matches(engine.values(), _ta(forming_close, forming_volume).iloc[-1])
+        engine.update(i * HOUR_MS, close[i], volume[i])
+        _assert_matches(engine.values(), expected.iloc[i])
+
+def test_older_candle_is_rejected():
+    engine = StreamingIndicators(**WINDOWS)
+    engine.update(2 * HOUR_MS, 100.0, 1.0)
+    with pytest.raises(ValueError):
+        engine.update(HOUR_MS, 100.0, 1.0)
+
+def _frame(close, volume, start, end):
+    df = pd.DataFrame({
+        'timestamp': (np.arange(start, end) * HOUR_MS).astype('datetime64[ms]'),
+        'open': close[start:end], 'high': close[start:end], 'low': close[start:end],
+        'close': close[start:end], 'volume': volume[start:end],
+    })
+    df.attrs['symbol'] = "BTC/USDT"
+    return df
+
+def test_analyzer_streaming_backend_carries_the_full_history(series):
+    close, volume, expected = series
+    analyzer = Analyzer(Settings())
+    for end in range(100, 600):
+        # 100-candle frames as the bot fetches them, the newest one first seen while forming
+        forming = _frame(close, volume, end - 100, end)
+        forming.loc[forming.index[-1], 'close'] *= 1.01
+        analyzer.analyze(forming)
+        signal, latest = analyzer.analyze(_frame(close, volume, end - 100, end))
+        _assert_matches(latest, expected.iloc[end - 1])
+        assert latest['volume_spike'] == (volume[end - 1] > expected['avg_volume'].iloc[end - 1] * 1.5)
+        assert signal in ("BUY", "SELL", "HOLD")
+
+def test_analyzer_streaming_backend_restarts_after_a_gap(series):
+    close, volume, _ = series
+    analyzer = Analyzer(Settings())
+    analyzer.analyze(_frame(close, volume, 0, 100))
+    _, latest = analyzer.analyze(_frame(close, volume, 300, 400))  # Nothing in common with what it has seen
+    _assert_matches(latest, _ta(close[300:400], volume[300:400]).iloc[-1])
@@ -0,0 +1,49 @@
+import tkinter as tk
+from collections import deque
+from tkinter import scrolledtext
+
+LOG_LEVELS = {"INFO": 0, "ERROR": 1}
+
+class LogView:
+    """
+    Log pane backed by a fixed-capacity ring buffer.
+
+    At most `max_lines` entries are kept, both in memory and in the text
+    widget, so insert and scroll costs stay flat however long the bot runs.
+    Entries below `min_level` are kept in the buffer but not shown.
+    """
+
+    def __init__(self, parent, max_lines: int = 1000, **text_options):
+        self.max_lines = max_lines
+        self.min_level = "INFO"
+        self.entries = deque(maxlen=max_lines)  # (level, message)
+        self._shown = deque()  # text lines taken by each entry currently in the widget
+        self.text = scrolledtext.ScrolledText(parent, **text_options)
+
+    def _visible(self, level: str) -> bool:
+        return LOG_LEVELS.get(level, 0) >= LOG_LEVELS[self.min_level]
+
+    def append(self, entries):
+        """Add (level, message) entries with a single insert, trimming the oldest lines"""
+        self.entries.extend(entries)
+        self._insert([message for level, message in entries[-self.max_lines:] if self._visible(level)])
+
+    def set_min_level(self, level: str):
+        """Show only entries at or above level, re-rendered from the buffer"""
+        self.min_level = level
+        self.text.delete("1.0", tk.END)
+        self._shown.clear()
+        self._insert([message for level, message in self.entries if self._visible(level)])
+
+    def _insert(self, messages):
+        if not messages:
+            return
+        self.text.insert(tk.END, "".join(message + "\n" for message in messages))
+        self._shown.extend(message.count("\n") + 1 for message in messages)
+
+        removed = 0
+        while len(self._shown) > self.max_lines:
+            removed += self._shown.popleft()
+        if removed:
+            self.text.delete("1.0", f"{removed + 1}.0")
+        self.text.see(tk.END)
@@ -1,7 +1,10 @@
 import tkinter as tk
-from tkinter import ttk, scrolledtext
+from tkinter import ttk
+from .log_view import LogView
 from .settings_window import SettingsWindow
 
+UI_FRAME_MS = 100  # How often worker events are rendered, caps redraws at 10 per second
+
 class MainWindow(tk.Tk):
     def __init__(self, bot_manager):
         super().__init__()
@@ -20,6 +23,7 @@ class MainWindow(tk.Tk):
         self._create_widgets()
         self._setup_layout()
         self._configure_theme()
+        self.after(UI_FRAME_MS, self._drain_events)
 
     def _create_widgets(self):
         """Initialize all GUI widgets"""
@@ -40,17 +44,28 @@ class MainWindow(tk.Tk):
         self.start_btn = ttk.Button(self.control_frame, text="Start Bot", command=self.start_bot)
         self.stop_btn = ttk.Button(self.control_frame, text="Stop Bot", command=self.stop_bot, state=tk.DISABLED)
         self.settings_btn = ttk.Button(self.control_frame, text="Settings", command=self.open_settings)
+        self.profile_btn = ttk.Button(self.control_frame, text="Profile", command=self.profile_bot)
         self.theme_btn = ttk.Button(self.control_frame, text="Toggle Theme", command=self.toggle_theme)
         
         # Log Frame
         self.log_frame = ttk.LabelFrame(self, text="Logs", padding=10)
-        self.log_text = scrolledtext.ScrolledText(
+        self.log_filter = ttk.Combobox(
+            self.log_frame,
+            values=["INFO", "ERROR"],
+            state="readonly",
+            width=8
+        )
+        self.log_filter.set("INFO")
+        self.log_filter.bind("<<ComboboxSelected>>", lambda _: self.log_view.set_min_level(self.log_filter.get()))
+        self.log_view = LogView(
             self.log_frame,
+            max_lines=self.bot_manager.config.LOG_MAX_LINES,
             height=20,
             font=("Consolas", 10),
             bg="white",
             fg="black"
         )
+        self.log_text = self.log_view.text
         
         # Stats Frame
         self.stats_frame = ttk.LabelFrame(self, text="Market Stats", padding=10)
@@ -75,12 +90,14 @@ class MainWindow(tk.Tk):
         self.start_btn.pack(side=tk.LEFT, padx=5)
         self.stop_btn.pack(side=tk.LEFT, padx=5)
         self.settings_btn.pack(side=tk.LEFT, padx=5)
+        self.profile_btn.pack(side=tk.LEFT, padx=5)
         self.theme_btn.pack(side=tk.RIGHT, padx=5)
         
         # Stats and Log Frames
         self.stats_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         self.stats_text.pack(fill=tk.BOTH, expand=True)
         self.log_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.log_filter.pack(anchor=tk.E, pady=(0, 5))
         self.log_text.pack(fill=tk.BOTH, expand=True)
 
     def _configure_theme(self):
@@ -166,6 +183,10 @@ class MainWindow(tk.Tk):
             self.stop_btn.config(state=tk.DISABLED)
             self.log("Bot stopped successfully")
 
+    def profile_bot(self):
+        """Profile the next cycles, the summary shows up in the log"""
+        self.log(self.bot_manager.request_profile())
+
     def open_settings(self):
         """Open the settings window"""
         SettingsWindow(
@@ -188,10 +209,21 @@ class MainWindow(tk.Tk):
             self.log(f"Error applying settings: {e}")
 
     def log(self, message):
-        """Add a message to the log"""
-        self.log_text.insert(tk.END, message + "\n")
-        self.log_text.see(tk.END)
-        self.log_text.update()
+        """Add a message to the log (Tk thread only, workers go through bot_manager.events)"""
+        self.log_view.append([("INFO", message)])
+
+    def _drain_events(self):
+        """Render everything workers published since the last frame in one go"""
+        try:
+            logs, stats, signal = self.bot_manager.events.drain()
+            if logs:
+                self.log_view.append(logs)
+            if stats is not None:
+                self.update_stats(stats)
+            if signal is not None:
+                self.update_signal(signal)
+        finally:
+            self.after(UI_FRAME_MS, self._drain_events)
 
     def update_stats(self, data):
         """Update market statistics display"""
@@ -214,4 +246,5 @@ class MainWindow(tk.Tk):
     def on_close(self):
         """Handle window close event"""
         self.stop_bot()
+        self.bot_manager.notification_queue.stop()  # Flush queued messages before the process exits
         self.after(100, self.destroy)
\ No newline at end of file
@@ -1,19 +1,22 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import Dict
+from bot.cube import IndicatorCube
 
 class SettingsWindow(tk.Toplevel):
     def __init__(self, parent, config, exchange, on_save_callback):
         super().__init__(parent)
         self.title("Bot Settings")
-        self.geometry("500x600")  # Increased height to fit all controls
+        self.geometry("500x640")  # Increased height to fit all controls
         self.config = config
         self.exchange = exchange
         self.on_save_callback = on_save_callback
+        self.cube = None
         
         self._create_widgets()
         self._setup_layout()
         self._load_current_settings()
+        self._load_preview_history()
 
     def _create_widgets(self):
         # Exchange Settings Frame
@@ -78,6 +81,15 @@ class SettingsWindow(tk.Toplevel):
             width=5
         )
         
+        # Signal preview over the candles already loaded, updated on every change
+        self.preview_label = ttk.Label(self.indicator_frame, text="")
+        for spinbox in (self.rsi_spinbox, self.ma_short_spinbox, self.ma_long_spinbox,
+                        self.bb_window_spinbox, self.volume_ratio_spinbox):
+            spinbox.configure(command=self._update_preview)
+            spinbox.bind("<KeyRelease>", lambda event: self._update_preview())
+        for combobox in (self.pair_combobox, self.timeframe_combobox):
+            combobox.bind("<<ComboboxSelected>>", lambda event: self._load_preview_history())
+        
         # Control Buttons
         self.button_frame = ttk.Frame(self, padding=10)
         self.save_btn = ttk.Button(self.button_frame, text="Save", command=self._save_settings)
@@ -123,6 +135,9 @@ class SettingsWindow(tk.Toplevel):
         self.volume_ratio_label.grid(row=4, column=0, padx=5, pady=5, sticky=tk.W)
         self.volume_ratio_spinbox.grid(row=4, column=1, padx=5, pady=5, sticky=tk.W)
         
+        # Preview row
+        self.preview_label.grid(row=5, column=0, columnspan=2, padx=5, pady=5, sticky=tk.W)
+        
         # Buttons Frame Layout
         self.button_frame.pack(fill=tk.X, padx=5, pady=5)
         self.save_btn.pack(side=tk.RIGHT, padx=5)
@@ -143,10 +158,36 @@ class SettingsWindow(tk.Toplevel):
         self.bb_window_spinbox.set(self.config.BB_WINDOW)
         self.volume_ratio_spinbox.set(self.config.VOLUME_SPIKE_RATIO)
 
+    def _load_preview_history(self):
+        """Precompute every spinbox setting over the candles held for the selected pair"""
+        ohlcv = self.exchange.get_cached_ohlcv(self.pair_combobox.get(), self.timeframe_combobox.get())
+        self.cube = IndicatorCube(ohlcv[:, 4], ohlcv[:, 5]) if ohlcv is not None else None
+        self._update_preview()
+
+    def _update_preview(self):
+        if self.cube is None:
+            self.preview_label.config(text="Preview: no candles loaded for this pair yet")
+            return
+        try:
+            preview = self.cube.preview(
+                rsi_window=int(self.rsi_spinbox.get()),
+                sma_short=int(self.ma_short_spinbox.get()),
+                sma_long=int(self.ma_long_spinbox.get()),
+                bb_window=int(self.bb_window_spinbox.get()),
+                volume_spike_ratio=float(self.volume_ratio_spinbox.get())
+            )
+        except ValueError:
+            self.preview_label.config(text="Preview: value out of range")
+            return
+        self.preview_label.config(
+            text=f"Preview ({len(self.cube.close)} candles): {preview['buy']} BUY, "
+                 f"{preview['sell']} SELL, latest {preview['latest']}"
+        )
+
     def _refresh_pairs(self):
         """Reload available pairs from exchange"""
         try:
-            self.exchange._load_supported_pairs()
+            self.exchange._load_supported_pairs(force_refresh=True)
             available_pairs = self.exchange.get_available_pairs()
             self.pair_combobox['values'] = available_pairs
             messagebox.showinfo("Success", f"Refreshed {len(available_pairs)} pairs")